@@ -0,0 +1,65 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from app.core.config import settings
+from app.core.database import Base
+# Import models so their tables are registered on Base.metadata
+from app.models import user, feed, category, leader  # noqa: F401
+
+config = context.config
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Full-text index tables are managed by app.services.search_index
+SEARCH_INDEX_PREFIXES = ("source_entries_fts", "source_entry_search")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return not name.startswith(SEARCH_INDEX_PREFIXES)
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of running it against a database"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can only alter tables by copying them
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_name=include_name,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,100 @@
+"""initial schema
+
+The schema Base.metadata.create_all built before migrations existed:
+feeds and feed items stored per subscription. Databases created by that
+version are stamped at this revision and upgraded from here.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 23:17:34.778433
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=True),
+    sa.Column('auth_provider', sa.Enum('EMAIL', 'GOOGLE', name='authprovider'), nullable=False),
+    sa.Column('google_id', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_google_id', 'users', ['google_id'], unique=True)
+
+    op.create_table('categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_categories_id', 'categories', ['id'])
+
+    op.create_table('feeds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('feed_type', sa.Enum('RSS', 'TWITTER', name='feedtype'), nullable=False),
+    sa.Column('config', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_fetched_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_feeds_id', 'feeds', ['id'])
+
+    op.create_table('feed_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('feed_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('published_at', sa.DateTime(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['feed_id'], ['feeds.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_feed_items_id', 'feed_items', ['id'])
+
+    op.create_table('category_assignments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('feed_item_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['feed_item_id'], ['feed_items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_category_assignments_id', 'category_assignments', ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('category_assignments')
+    op.drop_table('feed_items')
+    op.drop_table('feeds')
+    op.drop_table('categories')
+    op.drop_table('users')
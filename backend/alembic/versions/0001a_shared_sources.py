@@ -0,0 +1,231 @@
+"""shared feed sources
+
+Moves fetched content from per-subscription rows to sources shared by
+every subscriber of a URL. Each distinct normalized feed URL becomes a
+feed_sources row and each distinct article of a source a source_entries
+row; feeds point at their source and feed_items at their entry, keeping
+read_at. Items a feed held twice for the same article are merged.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-17 10:41:52.316084
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+from urllib.parse import urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# The feedtype enum already exists on PostgreSQL, created with the feeds table
+feed_type = sa.Enum('RSS', 'TWITTER', name='feedtype').with_variant(
+    postgresql.ENUM('RSS', 'TWITTER', name='feedtype', create_type=False), 'postgresql'
+)
+
+feeds = sa.table(
+    'feeds',
+    sa.column('id', sa.Integer),
+    sa.column('url', sa.String),
+    sa.column('feed_type', sa.String),
+    sa.column('config', sa.JSON),
+    sa.column('created_at', sa.DateTime),
+    sa.column('last_fetched_at', sa.DateTime),
+    sa.column('source_id', sa.Integer),
+)
+feed_sources = sa.table(
+    'feed_sources',
+    sa.column('id', sa.Integer),
+    sa.column('url', sa.String),
+    sa.column('feed_type', feed_type),
+    sa.column('config', sa.JSON),
+    sa.column('created_at', sa.DateTime),
+    sa.column('last_fetched_at', sa.DateTime),
+    sa.column('next_fetch_at', sa.DateTime),
+    sa.column('error_count', sa.Integer),
+)
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{credentials}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def source_key(feed_type, url, config):
+    if feed_type == 'TWITTER':
+        config = config or {}
+        if 'username' in config:
+            return f"twitter://user/{config['username'].lstrip('@').lower()}"
+        if 'hashtag' in config:
+            return f"twitter://hashtag/{config['hashtag'].lstrip('#').lower()}"
+    return normalize_url(url)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('feed_sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('feed_type', feed_type, nullable=False),
+    sa.Column('config', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_fetched_at', sa.DateTime(), nullable=True),
+    sa.Column('etag', sa.String(), nullable=True),
+    sa.Column('last_modified', sa.String(), nullable=True),
+    sa.Column('last_status', sa.Integer(), nullable=True),
+    sa.Column('next_fetch_at', sa.DateTime(), nullable=False),
+    sa.Column('poll_interval', sa.Integer(), nullable=True),
+    sa.Column('update_interval', sa.Integer(), nullable=True),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_feed_sources_id', 'feed_sources', ['id'])
+    op.create_index('ix_feed_sources_url', 'feed_sources', ['url'], unique=True)
+    op.create_index('ix_feed_sources_next_fetch_at', 'feed_sources', ['next_fetch_at'])
+
+    op.create_table('source_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('published_at', sa.DateTime(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['source_id'], ['feed_sources.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_source_entries_id', 'source_entries', ['id'])
+
+    with op.batch_alter_table('feeds') as batch_op:
+        batch_op.add_column(sa.Column('source_id', sa.Integer(), nullable=True))
+    with op.batch_alter_table('feed_items') as batch_op:
+        batch_op.add_column(sa.Column('entry_id', sa.Integer(), nullable=True))
+
+    # One source per distinct normalized URL, described by its oldest subscription
+    bind = op.get_bind()
+    subscriptions = {}
+    for feed in bind.execute(sa.select(feeds).order_by(feeds.c.id)):
+        subscriptions.setdefault(source_key(feed.feed_type, feed.url, feed.config), []).append(feed)
+    now = datetime.utcnow()
+    if subscriptions:
+        bind.execute(feed_sources.insert(), [
+            {
+                'url': key,
+                'feed_type': subscribed[0].feed_type,
+                'config': dict(subscribed[0].config or {}),
+                'created_at': min((feed.created_at for feed in subscribed if feed.created_at), default=now),
+                'last_fetched_at': max((feed.last_fetched_at for feed in subscribed if feed.last_fetched_at), default=None),
+                'next_fetch_at': now,  # Due right away
+                'error_count': 0,
+            }
+            for key, subscribed in subscriptions.items()
+        ])
+        source_ids = dict(bind.execute(sa.select(feed_sources.c.url, feed_sources.c.id)).all())
+        bind.execute(feeds.update().where(feeds.c.id == sa.bindparam('feed_id')).values(source_id=sa.bindparam('sid')), [
+            {'feed_id': feed.id, 'sid': source_ids[key]}
+            for key, subscribed in subscriptions.items() for feed in subscribed
+        ])
+
+    # Dropped again below; 0002 creates the permanent unique indexes
+    op.create_index('tmp_source_entries_source_url', 'source_entries', ['source_id', 'url'])
+    op.create_index('tmp_feed_items_feed_entry', 'feed_items', ['feed_id', 'entry_id'])
+
+    # One entry per article of a source, taken from the oldest item that has it
+    op.execute(
+        "INSERT INTO source_entries (source_id, title, content, url, published_at, fetched_at) "
+        "SELECT feeds.source_id, feed_items.title, feed_items.content, feed_items.url, "
+        "feed_items.published_at, feed_items.fetched_at "
+        "FROM feed_items JOIN feeds ON feeds.id = feed_items.feed_id "
+        "WHERE feed_items.id IN (SELECT min(feed_items.id) FROM feed_items "
+        "JOIN feeds ON feeds.id = feed_items.feed_id GROUP BY feeds.source_id, feed_items.url) "
+        "ORDER BY feed_items.id"
+    )
+    op.execute(
+        "UPDATE feed_items SET entry_id = (SELECT source_entries.id FROM source_entries "
+        "JOIN feeds ON feeds.source_id = source_entries.source_id "
+        "WHERE feeds.id = feed_items.feed_id AND source_entries.url = feed_items.url)"
+    )
+
+    # A feed may have stored the same article twice under URLs that now
+    # match. Keep the oldest item, read if any copy was, with every
+    # category assignment of the copies.
+    op.execute(
+        "UPDATE feed_items SET read_at = (SELECT min(copy.read_at) FROM feed_items AS copy "
+        "WHERE copy.feed_id = feed_items.feed_id AND copy.entry_id = feed_items.entry_id) "
+        "WHERE read_at IS NULL"
+    )
+    op.execute(
+        "UPDATE category_assignments SET feed_item_id = (SELECT min(kept.id) FROM feed_items AS kept "
+        "JOIN feed_items AS copy ON copy.feed_id = kept.feed_id AND copy.entry_id = kept.entry_id "
+        "WHERE copy.id = category_assignments.feed_item_id)"
+    )
+    op.execute(
+        "DELETE FROM feed_items WHERE id NOT IN "
+        "(SELECT min(id) FROM feed_items GROUP BY feed_id, entry_id)"
+    )
+
+    op.drop_index('tmp_feed_items_feed_entry', table_name='feed_items')
+    op.drop_index('tmp_source_entries_source_url', table_name='source_entries')
+
+    with op.batch_alter_table('feeds') as batch_op:
+        batch_op.alter_column('source_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('feeds_source_id_fkey', 'feed_sources', ['source_id'], ['id'])
+        batch_op.drop_column('last_fetched_at')
+    with op.batch_alter_table('feed_items') as batch_op:
+        batch_op.alter_column('entry_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('feed_items_entry_id_fkey', 'source_entries', ['entry_id'], ['id'])
+        batch_op.drop_column('url')
+        batch_op.drop_column('content')
+        batch_op.drop_column('title')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('feeds') as batch_op:
+        batch_op.add_column(sa.Column('last_fetched_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('feed_items') as batch_op:
+        batch_op.add_column(sa.Column('title', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('content', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('url', sa.String(), nullable=True))
+
+    # Copy shared content back onto every subscription
+    op.execute(
+        "UPDATE feeds SET last_fetched_at = (SELECT feed_sources.last_fetched_at FROM feed_sources "
+        "WHERE feed_sources.id = feeds.source_id)"
+    )
+    op.execute(
+        "UPDATE feed_items SET "
+        "title = (SELECT title FROM source_entries WHERE source_entries.id = feed_items.entry_id), "
+        "content = (SELECT content FROM source_entries WHERE source_entries.id = feed_items.entry_id), "
+        "url = (SELECT url FROM source_entries WHERE source_entries.id = feed_items.entry_id)"
+    )
+
+    with op.batch_alter_table('feed_items') as batch_op:
+        batch_op.alter_column('title', existing_type=sa.String(), nullable=False)
+        batch_op.alter_column('url', existing_type=sa.String(), nullable=False)
+        batch_op.drop_constraint('feed_items_entry_id_fkey', type_='foreignkey')
+        batch_op.drop_column('entry_id')
+    with op.batch_alter_table('feeds') as batch_op:
+        batch_op.drop_constraint('feeds_source_id_fkey', type_='foreignkey')
+        batch_op.drop_column('source_id')
+    op.drop_table('source_entries')
+    op.drop_table('feed_sources')
@@ -0,0 +1,62 @@
+"""composite indexes for item listings, dedupe and assignments
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-16 23:40:12.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+unread = sa.text('read_at IS NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The pagination cursor assumes a non-null sort key
+    op.execute("UPDATE feed_items SET published_at = fetched_at WHERE published_at IS NULL")
+
+    op.create_index('ix_feed_items_feed_published', 'feed_items',
+                    ['feed_id', sa.text('published_at DESC'), sa.text('id DESC')])
+    op.create_index('uq_feed_items_feed_entry', 'feed_items', ['feed_id', 'entry_id'], unique=True)
+    op.create_index('ix_feed_items_unread', 'feed_items',
+                    ['feed_id', sa.text('published_at DESC'), sa.text('id DESC')],
+                    sqlite_where=unread, postgresql_where=unread)
+
+    op.create_index('uq_source_entries_source_url', 'source_entries', ['source_id', 'url'], unique=True)
+    op.create_index('ix_source_entries_source_published', 'source_entries', ['source_id', 'published_at'])
+
+    op.create_index('ix_feeds_user_id', 'feeds', ['user_id'])
+    op.create_index('ix_feeds_source_id', 'feeds', ['source_id'])
+    op.create_index('ix_feeds_category_id', 'feeds', ['category_id'])
+
+    op.create_index('ix_categories_user_id', 'categories', ['user_id'])
+    op.create_index('ix_categories_parent_id', 'categories', ['parent_id'])
+
+    op.create_index('ix_category_assignments_category_id', 'category_assignments', ['category_id'])
+    op.create_index('ix_category_assignments_feed_item_id', 'category_assignments', ['feed_item_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_category_assignments_feed_item_id', table_name='category_assignments')
+    op.drop_index('ix_category_assignments_category_id', table_name='category_assignments')
+    op.drop_index('ix_categories_parent_id', table_name='categories')
+    op.drop_index('ix_categories_user_id', table_name='categories')
+    op.drop_index('ix_feeds_category_id', table_name='feeds')
+    op.drop_index('ix_feeds_source_id', table_name='feeds')
+    op.drop_index('ix_feeds_user_id', table_name='feeds')
+    op.drop_index('ix_source_entries_source_published', table_name='source_entries')
+    op.drop_index('uq_source_entries_source_url', table_name='source_entries')
+    op.drop_index('ix_feed_items_unread', table_name='feed_items')
+    op.drop_index('uq_feed_items_feed_entry', table_name='feed_items')
+    op.drop_index('ix_feed_items_feed_published', table_name='feed_items')
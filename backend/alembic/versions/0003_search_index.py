@@ -0,0 +1,68 @@
+"""full-text search index over source entries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 10:12:41.503117
+
+"""
+import html
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def plain_text(content):
+    if not content:
+        return ""
+    return re.sub(r"\s+", " ", html.unescape(re.sub(r"<[^>]+>", " ", content))).strip()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE source_entries_fts "
+                   "USING fts5(title, content, content='', tokenize='porter unicode61')")
+        insert = sa.text("INSERT INTO source_entries_fts (rowid, title, content) "
+                         "VALUES (:entry_id, :title, :content)")
+    elif bind.dialect.name == 'postgresql':
+        op.execute("CREATE TABLE source_entry_search ("
+                   "entry_id INTEGER PRIMARY KEY REFERENCES source_entries (id) ON DELETE CASCADE, "
+                   "document TSVECTOR NOT NULL)")
+        op.execute("CREATE INDEX ix_source_entry_search_document ON source_entry_search USING GIN (document)")
+        insert = sa.text("INSERT INTO source_entry_search (entry_id, document) VALUES (:entry_id, "
+                         "setweight(to_tsvector('english', :title), 'A') || "
+                         "setweight(to_tsvector('english', :content), 'B'))")
+    else:
+        return
+
+    # Index the entries already stored
+    result = bind.execute(sa.text("SELECT id, title, content FROM source_entries ORDER BY id"))
+    while True:
+        rows = result.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        bind.execute(insert, [
+            {'entry_id': entry_id, 'title': title or "", 'content': plain_text(content)}
+            for entry_id, title, content in rows
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE source_entries_fts")
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP TABLE source_entry_search")
@@ -0,0 +1,58 @@
+"""precomputed plain-text excerpt on source entries
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:31:05.774210
+
+"""
+import html
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+EXCERPT_LENGTH = 280
+
+
+def excerpt(content):
+    text = re.sub(r"\s+", " ", html.unescape(re.sub(r"<[^>]+>", " ", content or ""))).strip()
+    if not text:
+        return None
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    cut = text[:EXCERPT_LENGTH].rsplit(" ", 1)[0] or text[:EXCERPT_LENGTH]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('source_entries') as batch_op:
+        batch_op.add_column(sa.Column('excerpt', sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    update = sa.text("UPDATE source_entries SET excerpt = :excerpt WHERE id = :entry_id")
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, content FROM source_entries WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {'last_id': last_id, 'limit': BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        bind.execute(update, [{'entry_id': entry_id, 'excerpt': excerpt(content)} for entry_id, content in rows])
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('source_entries') as batch_op:
+        batch_op.drop_column('excerpt')
@@ -0,0 +1,93 @@
+"""move article bodies to compressed, content-addressed blobs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 15:02:47.390561
+
+"""
+import hashlib
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('content_blobs',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    with op.batch_alter_table('source_entries') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    bind = op.get_bind()
+    stored = set()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, content FROM source_entries WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {'last_id': last_id, 'limit': BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        blobs, updates = [], []
+        for entry_id, content in rows:
+            if not content:
+                continue
+            raw = content.encode('utf-8')
+            digest = hashlib.sha256(raw).hexdigest()
+            if digest not in stored:
+                stored.add(digest)
+                blobs.append({'hash': digest, 'data': zlib.compress(raw, 6), 'size': len(raw)})
+            updates.append({'entry_id': entry_id, 'content_hash': digest})
+        if blobs:
+            bind.execute(sa.text("INSERT INTO content_blobs (hash, data, size) VALUES (:hash, :data, :size)"), blobs)
+        if updates:
+            bind.execute(sa.text("UPDATE source_entries SET content_hash = :content_hash WHERE id = :entry_id"), updates)
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table('source_entries') as batch_op:
+        batch_op.create_foreign_key('fk_source_entries_content_hash', 'content_blobs', ['content_hash'], ['hash'])
+        batch_op.create_index('ix_source_entries_content_hash', ['content_hash'])
+        batch_op.drop_column('content')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('source_entries') as batch_op:
+        batch_op.add_column(sa.Column('content', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT source_entries.id, content_blobs.data FROM source_entries "
+                    "JOIN content_blobs ON content_blobs.hash = source_entries.content_hash "
+                    "WHERE source_entries.id > :last_id ORDER BY source_entries.id LIMIT :limit"),
+            {'last_id': last_id, 'limit': BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        bind.execute(sa.text("UPDATE source_entries SET content = :content WHERE id = :entry_id"), [
+            {'entry_id': entry_id, 'content': zlib.decompress(data).decode('utf-8')} for entry_id, data in rows
+        ])
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table('source_entries') as batch_op:
+        batch_op.drop_index('ix_source_entries_content_hash')
+        batch_op.drop_constraint('fk_source_entries_content_hash', type_='foreignkey')
+        batch_op.drop_column('content_hash')
+    op.drop_table('content_blobs')
@@ -0,0 +1,39 @@
+"""item and unread counters on feeds
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 17:48:20.631904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('feeds') as batch_op:
+        batch_op.add_column(sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE feeds SET "
+        "item_count = (SELECT count(*) FROM feed_items WHERE feed_items.feed_id = feeds.id), "
+        "unread_count = (SELECT count(*) FROM feed_items WHERE feed_items.feed_id = feeds.id "
+        "AND feed_items.read_at IS NULL)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('feeds') as batch_op:
+        batch_op.drop_column('unread_count')
+        batch_op.drop_column('item_count')
@@ -0,0 +1,32 @@
+"""fetch leases on feed sources
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 10:12:41.208317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('feed_sources') as batch_op:
+        batch_op.add_column(sa.Column('lease_owner', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('feed_sources') as batch_op:
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('lease_owner')
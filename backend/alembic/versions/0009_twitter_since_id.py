@@ -0,0 +1,30 @@
+"""tweet high-water mark on feed sources
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 09:24:17.530862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('feed_sources') as batch_op:
+        batch_op.add_column(sa.Column('since_id', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('feed_sources') as batch_op:
+        batch_op.drop_column('since_id')
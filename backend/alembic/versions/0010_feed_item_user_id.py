@@ -0,0 +1,43 @@
+"""owning user on feed items, for the all-items listing
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 14:08:33.902715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('feed_items') as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE feed_items SET user_id = (SELECT feeds.user_id FROM feeds WHERE feeds.id = feed_items.feed_id)"
+    )
+
+    with op.batch_alter_table('feed_items') as batch_op:
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('feed_items_user_id_fkey', 'users', ['user_id'], ['id'])
+
+    op.create_index('ix_feed_items_user_published', 'feed_items',
+                    ['user_id', sa.text('published_at DESC'), sa.text('id DESC')])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_feed_items_user_published', table_name='feed_items')
+    with op.batch_alter_table('feed_items') as batch_op:
+        batch_op.drop_constraint('feed_items_user_id_fkey', type_='foreignkey')
+        batch_op.drop_column('user_id')
@@ -7,6 +7,7 @@ from typing import Optional
 from app.core.database import get_db
 from app.core.security import verify_password, get_password_hash, create_access_token
 from app.core.config import settings
+from app.core.user_cache import user_cache
 from app.models.user import User, AuthProvider
 from app.schemas.auth import UserCreate, UserResponse, Token, GoogleAuthRequest
 from app.api.dependencies import get_current_user
@@ -62,7 +63,7 @@ def login(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 
@@ -115,6 +116,7 @@ def google_callback(auth_data: GoogleAuthRequest, db: Session = Depends(get_db))
             user.google_id = user_info['google_id']
             user.auth_provider = AuthProvider.GOOGLE
             db.commit()
+            user_cache.invalidate(user.email)
         
         # Generate JWT token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
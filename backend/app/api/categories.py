@@ -1,31 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.user import User
 from app.models.category import Category, CategoryAssignment
-from app.models.feed import FeedItem
+from app.models.feed import Feed, FeedItem
 from app.schemas.category import (
     CategoryCreate, CategoryUpdate, CategoryResponse,
     CategoryAssignmentCreate, CategoryAssignmentResponse
 )
-from app.schemas.feed import FeedItemResponse
+from app.schemas.feed import FeedItemPage
 from app.api.dependencies import get_current_user
+from app.api.pagination import paginate_items, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.projections import FIELDS_DESCRIPTION, parse_fields
+from app.services.category_tree import (
+    build_category_tree, index_category_tree, category_subtree, category_scope, items_in_categories
+)
+from app.services.feed_sources import release_source
 
 router = APIRouter(prefix="/api/categories", tags=["categories"])
 
 
-def build_category_tree(categories: List[Category], parent_id: int = None) -> List[CategoryResponse]:
-    """Build hierarchical category tree"""
-    children = [c for c in categories if c.parent_id == parent_id]
-    result = []
-    for cat in children:
-        cat_dict = CategoryResponse.model_validate(cat).model_dump()
-        cat_dict["children"] = build_category_tree(categories, cat.id)
-        result.append(CategoryResponse(**cat_dict))
-    return result
-
-
 @router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 def create_category(
     category_data: CategoryCreate,
@@ -55,24 +52,22 @@ def create_category(
 
 
 @router.get("", response_model=List[CategoryResponse])
-def get_categories(
+async def get_categories(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    categories = db.query(Category).filter(Category.user_id == current_user.id).all()
+    categories = (await db.scalars(select(Category).filter(Category.user_id == current_user.id))).all()
     return build_category_tree(categories)
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(
+async def get_category(
     category_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    category = db.query(Category).filter(
-        Category.id == category_id,
-        Category.user_id == current_user.id
-    ).first()
+    categories = (await db.scalars(select(Category).filter(Category.user_id == current_user.id))).all()
+    category = index_category_tree(categories).get(category_id)
     
     if not category:
         raise HTTPException(
@@ -107,6 +102,11 @@ def update_category(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Category cannot be its own parent"
         )
+    if category_data.parent_id and category_data.parent_id in db.scalars(category_subtree(category_id)).all():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Category cannot be moved under one of its subcategories"
+        )
     
     # Verify new parent exists and belongs to user if specified
     if category_data.parent_id:
@@ -154,7 +154,12 @@ def delete_category(
             detail="Cannot delete category with children. Delete or move children first."
         )
     
+    # Its feeds are deleted with it; drop sources nobody else subscribes to
+    sources = [feed.source for feed in category.feeds]
     db.delete(category)
+    db.flush()
+    for source in {source.id: source for source in sources}.values():
+        release_source(db, source)
     db.commit()
     return None
 
@@ -227,18 +232,24 @@ def remove_item_from_category(
     return None
 
 
-@router.get("/{category_id}/items", response_model=List[FeedItemResponse])
-def get_category_items(
+@router.get("/{category_id}/items", response_model=FeedItemPage, response_model_exclude_unset=True)
+async def get_category_items(
     category_id: int,
     since_date: Optional[str] = None,
+    include_subcategories: bool = Query(False, description="Also include items from every descendant category"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    fields = parse_fields(fields)
+    
     # Verify category belongs to user
-    category = db.query(Category).filter(
+    category = await db.scalar(select(Category.id).filter(
         Category.id == category_id,
         Category.user_id == current_user.id
-    ).first()
+    ))
     
     if not category:
         raise HTTPException(
@@ -246,26 +257,8 @@ def get_category_items(
             detail="Category not found"
         )
     
-    # Get items from feeds in this category AND items assigned to this category
-    feed_ids = [f.id for f in category.feeds] if category.feeds else []
-    assignments = db.query(CategoryAssignment).filter(
-        CategoryAssignment.category_id == category_id
-    ).all()
-    assigned_item_ids = [a.feed_item_id for a in assignments]
-    
-    # Combine items from feeds in category and assigned items
-    query = db.query(FeedItem)
-    if feed_ids or assigned_item_ids:
-        conditions = []
-        if feed_ids:
-            conditions.append(FeedItem.feed_id.in_(feed_ids))
-        if assigned_item_ids:
-            conditions.append(FeedItem.id.in_(assigned_item_ids))
-        from sqlalchemy import or_
-        query = query.filter(or_(*conditions))
-    else:
-        # No feeds or assignments, return empty
-        return []
+    # Items from feeds in this category AND items assigned to this category
+    query = select(FeedItem).filter(items_in_categories(category_scope(category_id, include_subcategories)))
     
     # Filter by date if provided
     if since_date:
@@ -279,6 +272,4 @@ def get_category_items(
                 detail="Invalid date format. Use YYYY-MM-DD"
             )
     
-    items = query.order_by(FeedItem.published_at.desc()).all()
-    return items
-
+    return await paginate_items(db, query, cursor, limit, fields)
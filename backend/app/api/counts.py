@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy import case, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.models.user import User
+from app.models.feed import Feed, FeedItem
+from app.models.category import Category, CategoryAssignment
+from app.schemas.counts import CountsResponse, ItemCounts
+from app.api.dependencies import get_current_user
+
+router = APIRouter(prefix="/api/counts", tags=["counts"])
+
+
+def _lineage(parents: Dict[int, Optional[int]], category_id: Optional[int]) -> List[int]:
+    """A category followed by its ancestors, stopping at a cycle"""
+    lineage = []
+    while category_id in parents and category_id not in lineage:
+        lineage.append(category_id)
+        category_id = parents[category_id]
+    return lineage
+
+
+@router.get("", response_model=CountsResponse)
+async def get_counts(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Item and unread counts for every feed and category, for sidebar badges.
+    
+    Reads the maintained counters on feeds, the category tree and the
+    manual category assignments in one round trip. A category counts the
+    same items as items_in_categories over its subtree: those of feeds filed
+    anywhere in it plus those assigned anywhere in it, each once.
+    """
+    rows = (await db.execute(union_all(
+        select(literal("feed"), Feed.id, Feed.category_id, Feed.item_count, Feed.unread_count).filter(
+            Feed.user_id == current_user.id
+        ),
+        select(literal("category"), Category.id, Category.parent_id, literal(0), literal(0)).filter(
+            Category.user_id == current_user.id
+        ),
+        select(
+            literal("assignment"), CategoryAssignment.feed_item_id, CategoryAssignment.category_id,
+            Feed.category_id, case((FeedItem.read_at.is_(None), 1), else_=0)
+        ).select_from(Category).join(
+            CategoryAssignment, CategoryAssignment.category_id == Category.id
+        ).join(
+            FeedItem, FeedItem.id == CategoryAssignment.feed_item_id
+        ).join(
+            Feed, Feed.id == FeedItem.feed_id
+        ).filter(
+            Category.user_id == current_user.id
+        )
+    ))).all()
+    
+    parents = {row_id: parent_id for kind, row_id, parent_id, _, _ in rows if kind == "category"}
+    category_totals = {category_id: [0, 0] for category_id in parents}
+    feeds = []
+    assigned = {}  # Item id -> (categories it is assigned to, its feed's category, unread)
+    for kind, row_id, category_id, item_count, unread_count in rows:
+        if kind == "assignment":
+            assigned.setdefault(row_id, (set(), item_count, unread_count))[0].add(category_id)
+        if kind != "feed":
+            continue
+        feeds.append(ItemCounts(id=row_id, item_count=item_count, unread_count=unread_count))
+        # Credit the feed's category and each of its ancestors once
+        for ancestor in _lineage(parents, category_id):
+            category_totals[ancestor][0] += item_count
+            category_totals[ancestor][1] += unread_count
+    
+    # An assigned item counts towards the assigned categories and their
+    # ancestors, except those its feed already credited it to
+    for categories, feed_category_id, unread in assigned.values():
+        credited = set(_lineage(parents, feed_category_id))
+        extra = set().union(*(_lineage(parents, category_id) for category_id in categories)) - credited
+        for category_id in extra:
+            category_totals[category_id][0] += 1
+            category_totals[category_id][1] += unread
+    
+    return CountsResponse(
+        feeds=feeds,
+        categories=[
+            ItemCounts(id=category_id, item_count=item_count, unread_count=unread_count)
+            for category_id, (item_count, unread_count) in category_totals.items()
+        ],
+        item_count=sum(feed.item_count for feed in feeds),
+        unread_count=sum(feed.unread_count for feed in feeds)
+    )
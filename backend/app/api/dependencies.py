@@ -1,8 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.core.security import decode_access_token
+from app.core.user_cache import CachedUser, user_cache
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
@@ -10,14 +12,18 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> CachedUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+    
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
@@ -26,9 +32,13 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).filter(User.email == email))
+    # End the read transaction right away so its connection (and SQLite's
+    # shared lock) isn't held while a sync endpoint writes
+    await db.commit()
     if user is None:
         raise credentials_exception
     
-    return user
-
+    cached = CachedUser.from_user(user)
+    user_cache.put(token, cached, payload.get("exp"))
+    return cached
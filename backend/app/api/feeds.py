@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+from app.core.database import get_db, get_async_db
 from app.models.user import User
 from app.models.feed import Feed, FeedItem
-from app.schemas.feed import FeedCreate, FeedUpdate, FeedResponse, FeedItemResponse, FeedItemUpdate
+from app.schemas.feed import FeedCreate, FeedUpdate, FeedResponse, FeedItemResponse, FeedItemUpdate, FeedItemPage
 from app.api.dependencies import get_current_user
+from app.api.pagination import paginate_items, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.projections import FIELDS_DESCRIPTION, parse_fields
 from app.services.feed_fetcher import FeedFetcher
+from app.services.counters import set_read_state
+from app.services.feed_sources import get_or_create_source, backfill_subscription, release_source
 
 router = APIRouter(prefix="/api/feeds", tags=["feeds"])
 
@@ -30,16 +36,21 @@ def create_feed(
                 detail="Category not found"
             )
     
+    source = get_or_create_source(db, feed_data.feed_type, feed_data.url, feed_data.config)
     db_feed = Feed(
         **feed_data.model_dump(),
-        user_id=current_user.id
+        user_id=current_user.id,
+        source_id=source.id
     )
     db.add(db_feed)
+    db.flush()
+    # Sources other users already follow have their entries on hand
+    backfill_subscription(db, db_feed)
     db.commit()
     db.refresh(db_feed)
     
     # Auto-fetch RSS feeds when created (async, don't block response)
-    if db_feed.feed_type.value == "rss":
+    if db_feed.feed_type.value == "rss" and source.last_fetched_at is None:
         import asyncio
         import threading
         
@@ -68,24 +79,26 @@ def create_feed(
 
 
 @router.get("", response_model=List[FeedResponse])
-def get_feeds(
+async def get_feeds(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    feeds = db.query(Feed).filter(Feed.user_id == current_user.id).all()
-    return feeds
+    feeds = await db.scalars(
+        select(Feed).options(joinedload(Feed.source)).filter(Feed.user_id == current_user.id)
+    )
+    return feeds.all()
 
 
 @router.get("/{feed_id}", response_model=FeedResponse)
-def get_feed(
+async def get_feed(
     feed_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    feed = db.query(Feed).filter(
+    feed = await db.scalar(select(Feed).options(joinedload(Feed.source)).filter(
         Feed.id == feed_id,
         Feed.user_id == current_user.id
-    ).first()
+    ))
     
     if not feed:
         raise HTTPException(
@@ -118,6 +131,16 @@ def update_feed(
     for field, value in update_data.items():
         setattr(feed, field, value)
     
+    # Point the subscription at a different source if the URL or config changed
+    old_source = feed.source
+    source = get_or_create_source(db, feed.feed_type, feed.url, feed.config)
+    if source.id != old_source.id:
+        feed.items = []
+        feed.source = source
+        db.flush()
+        backfill_subscription(db, feed)
+        release_source(db, old_source)
+    
     db.commit()
     db.refresh(feed)
     return feed
@@ -140,7 +163,10 @@ def delete_feed(
             detail="Feed not found"
         )
     
+    source = feed.source
     db.delete(feed)
+    db.flush()
+    release_source(db, source)
     db.commit()
     return None
 
@@ -174,17 +200,22 @@ def fetch_feed(
         )
 
 
-@router.get("/{feed_id}/items", response_model=List[FeedItemResponse])
-def get_feed_items(
+@router.get("/{feed_id}/items", response_model=FeedItemPage, response_model_exclude_unset=True)
+async def get_feed_items(
     feed_id: int,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    fields = parse_fields(fields)
+    
     # Verify feed belongs to user
-    feed = db.query(Feed).filter(
+    feed = await db.scalar(select(Feed.id).filter(
         Feed.id == feed_id,
         Feed.user_id == current_user.id
-    ).first()
+    ))
     
     if not feed:
         raise HTTPException(
@@ -192,8 +223,8 @@ def get_feed_items(
             detail="Feed not found"
         )
     
-    items = db.query(FeedItem).filter(FeedItem.feed_id == feed_id).order_by(FeedItem.published_at.desc()).all()
-    return items
+    query = select(FeedItem).filter(FeedItem.feed_id == feed_id)
+    return await paginate_items(db, query, cursor, limit, fields)
 
 
 @router.put("/items/{item_id}", response_model=FeedItemResponse)
@@ -215,6 +246,8 @@ def update_feed_item(
         )
     
     update_data = item_data.model_dump(exclude_unset=True)
+    if "read_at" in update_data:
+        set_read_state(db, item, update_data.pop("read_at"))
     for field, value in update_data.items():
         setattr(item, field, value)
     
@@ -1,72 +1,74 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime, date
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.user import User
-from app.models.feed import FeedItem, Feed
+from app.models.feed import FeedItem, Feed, SourceEntry
 from app.models.category import CategoryAssignment, Category
-from app.schemas.feed import FeedItemResponse, FeedItemUpdate
+from app.schemas.feed import FeedItemResponse, FeedItemUpdate, FeedItemPage, BulkMarkRead, BulkMarkReadResponse
 from app.api.dependencies import get_current_user
+from app.api.pagination import (
+    paginate_items, encode_offset_cursor, decode_offset_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+)
+from app.api.projections import FIELDS_DESCRIPTION, parse_fields, projection_options, summarize
+from app.services.category_tree import category_scope, items_in_categories
+from app.services.counters import count_read, set_read_state
+from app.services.search_index import match_query
 
 router = APIRouter(prefix="/api/items", tags=["items"])
 
 
-@router.get("", response_model=List[FeedItemResponse])
-def get_all_items(
+@router.get("", response_model=FeedItemPage, response_model_exclude_unset=True)
+async def get_all_items(
     category_id: Optional[int] = Query(None),
+    include_subcategories: bool = Query(False, description="With category_id, also include descendant categories"),
     feed_id: Optional[int] = Query(None),
     unread_only: bool = Query(False),
     since_date: Optional[str] = Query(None, description="Filter items published since this date (YYYY-MM-DD)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(FeedItem).join(Feed).filter(Feed.user_id == current_user.id)
+    fields = parse_fields(fields)
+    query = select(FeedItem)
+    # Scoped on the item's own user_id, so the newest-first listing is a
+    # seek on ix_feed_items_user_published rather than a sort of every item
+    owned = FeedItem.user_id == current_user.id
     
     if category_id:
         # Verify category belongs to user
-        category = db.query(Category).filter(
+        category = await db.scalar(select(Category).filter(
             Category.id == category_id,
             Category.user_id == current_user.id
-        ).first()
+        ))
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
             )
         
-        # Get items from feeds in this category AND items assigned to this category
-        feed_ids = [f.id for f in category.feeds] if category.feeds else []
-        assignments = db.query(CategoryAssignment).filter(
-            CategoryAssignment.category_id == category_id
-        ).all()
-        assigned_item_ids = [a.feed_item_id for a in assignments]
-        
-        # Combine both sources
-        if feed_ids or assigned_item_ids:
-            from sqlalchemy import or_
-            conditions = []
-            if feed_ids:
-                conditions.append(FeedItem.feed_id.in_(feed_ids))
-            if assigned_item_ids:
-                conditions.append(FeedItem.id.in_(assigned_item_ids))
-            query = query.filter(or_(*conditions))
-        else:
-            # No feeds or assignments, return empty
-            return []
+        # Items from feeds in this category AND items assigned to this category
+        query = query.filter(items_in_categories(category_scope(category_id, include_subcategories)))
     
     if feed_id:
         # Verify feed belongs to user
-        feed = db.query(Feed).filter(
+        feed = await db.scalar(select(Feed).filter(
             Feed.id == feed_id,
             Feed.user_id == current_user.id
-        ).first()
+        ))
         if not feed:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Feed not found"
             )
-        query = query.filter(FeedItem.feed_id == feed_id)
+        # The feed is the user's, and its own index is the narrower one
+        owned = FeedItem.feed_id == feed_id
+    query = query.filter(owned)
     
     if unread_only:
         query = query.filter(FeedItem.read_at.is_(None))
@@ -82,20 +84,90 @@ def get_all_items(
                 detail="Invalid date format. Use YYYY-MM-DD"
             )
     
-    items = query.order_by(FeedItem.published_at.desc()).all()
-    return items
+    return await paginate_items(db, query, cursor, limit, fields)
+
+
+@router.get("/search", response_model=FeedItemPage, response_model_exclude_unset=True)
+async def search_items(
+    q: str = Query(..., min_length=1, description="Words that must all appear in the title or content"),
+    category_id: Optional[int] = Query(None),
+    include_subcategories: bool = Query(False, description="With category_id, also include descendant categories"),
+    feed_id: Optional[int] = Query(None),
+    since_date: Optional[str] = Query(None, description="Filter items published since this date (YYYY-MM-DD)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Search the user's items, best match first.
+    
+    Matching runs against the full-text index, so cost follows the number of
+    hits rather than the size of feed_items.
+    """
+    fields = parse_fields(fields)
+    matches = match_query(db.get_bind().dialect.name, q)
+    if matches is None:
+        return FeedItemPage(items=[], next_cursor=None)
+    matches = matches.subquery()
+    
+    query = select(FeedItem).join(Feed).join(matches, matches.c.entry_id == FeedItem.entry_id).filter(
+        Feed.user_id == current_user.id
+    )
+    
+    if category_id:
+        category = await db.scalar(select(Category).filter(
+            Category.id == category_id,
+            Category.user_id == current_user.id
+        ))
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found"
+            )
+        query = query.filter(items_in_categories(category_scope(category_id, include_subcategories)))
+    
+    if feed_id:
+        query = query.filter(FeedItem.feed_id == feed_id)
+    
+    if since_date:
+        try:
+            since_datetime = datetime.strptime(since_date, "%Y-%m-%d")
+            query = query.filter(FeedItem.published_at >= since_datetime)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid date format. Use YYYY-MM-DD"
+            )
+    
+    # Rank isn't a stable keyset column (it shifts as the index grows), so
+    # search pages by offset
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    query = query.options(*projection_options(fields))
+    query = query.order_by(matches.c.rank, FeedItem.published_at.desc(), FeedItem.id.desc())
+    items = (await db.scalars(query.offset(offset).limit(limit + 1))).all()
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_offset_cursor(offset + limit)
+    return FeedItemPage(items=[summarize(item, fields) for item in items], next_cursor=next_cursor)
 
 
 @router.get("/{item_id}", response_model=FeedItemResponse)
-def get_item(
+async def get_item(
     item_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    item = db.query(FeedItem).join(Feed).filter(
+    # The one place the full body is read and decompressed
+    item = await db.scalar(select(FeedItem).join(Feed).options(
+        joinedload(FeedItem.entry).joinedload(SourceEntry.blob)
+    ).filter(
         FeedItem.id == item_id,
         Feed.user_id == current_user.id
-    ).first()
+    ))
     
     if not item:
         raise HTTPException(
@@ -125,6 +197,8 @@ def update_item(
         )
     
     update_data = item_data.model_dump(exclude_unset=True)
+    if "read_at" in update_data:
+        set_read_state(db, item, update_data.pop("read_at"))
     for field, value in update_data.items():
         setattr(item, field, value)
     
@@ -150,7 +224,7 @@ def mark_as_read(
             detail="Feed item not found"
         )
     
-    item.read_at = datetime.utcnow()
+    set_read_state(db, item, datetime.utcnow())
     db.commit()
     db.refresh(item)
     return item
@@ -173,23 +247,81 @@ def mark_as_unread(
             detail="Feed item not found"
         )
     
-    item.read_at = None
+    set_read_state(db, item, None)
     db.commit()
     db.refresh(item)
     return item
 
 
+@router.post("/mark-read", response_model=BulkMarkReadResponse)
+def mark_many_as_read(
+    selection: BulkMarkRead,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Mark every unread item matching the selection read with one UPDATE.
+    
+    The statement returns the feed of each row it flipped, which is all the
+    counters need, so no items are loaded.
+    """
+    conditions = [
+        FeedItem.read_at.is_(None),
+        FeedItem.feed_id.in_(select(Feed.id).filter(Feed.user_id == current_user.id))
+    ]
+    
+    if selection.feed_id:
+        feed = db.query(Feed.id).filter(
+            Feed.id == selection.feed_id,
+            Feed.user_id == current_user.id
+        ).first()
+        if not feed:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Feed not found"
+            )
+        conditions.append(FeedItem.feed_id == selection.feed_id)
+    
+    if selection.category_id:
+        category = db.query(Category.id).filter(
+            Category.id == selection.category_id,
+            Category.user_id == current_user.id
+        ).first()
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found"
+            )
+        # Items from feeds in the category and items assigned to it
+        conditions.append(items_in_categories(
+            category_scope(selection.category_id, selection.include_subcategories)
+        ))
+    
+    if selection.before:
+        conditions.append(FeedItem.published_at < selection.before)
+    
+    if selection.item_ids is not None:
+        conditions.append(FeedItem.id.in_(selection.item_ids))
+    
+    flipped = db.execute(
+        update(FeedItem).where(*conditions).values(read_at=datetime.utcnow()).returning(FeedItem.feed_id)
+    ).scalars().all()
+    count_read(db, flipped)
+    db.commit()
+    return BulkMarkReadResponse(updated=len(flipped))
+
+
 @router.get("/{item_id}/categories", response_model=List[int])
-def get_item_categories(
+async def get_item_categories(
     item_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify item belongs to user
-    item = db.query(FeedItem).join(Feed).filter(
+    item = await db.scalar(select(FeedItem.id).join(Feed).filter(
         FeedItem.id == item_id,
         Feed.user_id == current_user.id
-    ).first()
+    ))
     
     if not item:
         raise HTTPException(
@@ -197,8 +329,8 @@ def get_item_categories(
             detail="Feed item not found"
         )
     
-    assignments = db.query(CategoryAssignment).filter(
+    category_ids = await db.scalars(select(CategoryAssignment.category_id).filter(
         CategoryAssignment.feed_item_id == item_id
-    ).all()
+    ))
     
-    return [a.category_id for a in assignments]
+    return category_ids.all()
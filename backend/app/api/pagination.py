@@ -0,0 +1,76 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.feed import FeedItem
+from app.schemas.feed import FeedItemPage
+from app.api.projections import LIST_FIELDS, projection_options, summarize
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(item: FeedItem) -> str:
+    """Opaque cursor pointing just past `item` in (published_at, id) order"""
+    raw = f"{item.published_at.isoformat()}|{item.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, item_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(published_at), int(item_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque cursor for result sets without a stable sort key, such as ranked search"""
+    return base64.urlsafe_b64encode(f"offset|{offset}".encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, offset = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        if kind != "offset" or int(offset) < 0:
+            raise ValueError(cursor)
+        return int(offset)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def paginate_items(
+    db: AsyncSession,
+    query: Select,
+    cursor: Optional[str],
+    limit: int,
+    fields: Tuple[str, ...] = LIST_FIELDS
+) -> FeedItemPage:
+    """
+    Return one page of a FeedItem select, newest first, projected to `fields`.
+    
+    Seeks past the cursor with a (published_at, id) row comparison instead of
+    OFFSET, so every page costs the same however deep the client scrolls.
+    """
+    if cursor:
+        query = query.filter(tuple_(FeedItem.published_at, FeedItem.id) < decode_cursor(cursor))
+    
+    query = query.options(*projection_options(fields))
+    query = query.order_by(FeedItem.published_at.desc(), FeedItem.id.desc()).limit(limit + 1)
+    items = (await db.scalars(query)).all()
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1])
+    return FeedItemPage(items=[summarize(item, fields) for item in items], next_cursor=next_cursor)
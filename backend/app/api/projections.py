@@ -0,0 +1,67 @@
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy.orm import joinedload, lazyload, load_only
+from app.models.feed import FeedItem, SourceEntry
+from app.schemas.feed import FeedItemSummary
+
+# Columns a list can project, by where they live
+ITEM_COLUMNS = {
+    "id": FeedItem.id,
+    "feed_id": FeedItem.feed_id,
+    "published_at": FeedItem.published_at,
+    "fetched_at": FeedItem.fetched_at,
+    "read_at": FeedItem.read_at,
+}
+ENTRY_COLUMNS = {
+    "title": SourceEntry.title,
+    "url": SourceEntry.url,
+    "excerpt": SourceEntry.excerpt,
+    # Resolved through the entry's blob, see projection_options
+    "content": SourceEntry.content_hash,
+}
+LIST_FIELDS = ("id", "feed_id", "title", "url", "excerpt", "published_at", "fetched_at", "read_at")
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return, from: " + ", ".join({**ITEM_COLUMNS, **ENTRY_COLUMNS})
+    + ". Defaults to everything except content"
+)
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    if not fields:
+        return LIST_FIELDS
+    requested = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in ITEM_COLUMNS and name not in ENTRY_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return requested if "id" in requested else ("id",) + requested
+
+
+def projection_options(fields: Tuple[str, ...]) -> list:
+    """
+    Loader options that fetch only the columns behind `fields`.
+    
+    id and published_at are always loaded since the pagination cursor needs
+    them; the entry join is skipped entirely when no entry field is wanted,
+    and the content store is only joined when content is asked for.
+    """
+    item_columns = {FeedItem.id, FeedItem.published_at} | {
+        ITEM_COLUMNS[name] for name in fields if name in ITEM_COLUMNS
+    }
+    entry_columns = [ENTRY_COLUMNS[name] for name in fields if name in ENTRY_COLUMNS]
+    options = [load_only(*item_columns)]
+    if entry_columns:
+        entry = joinedload(FeedItem.entry).load_only(*entry_columns)
+        if "content" in fields:
+            entry = entry.joinedload(SourceEntry.blob)
+        options.append(entry)
+    else:
+        options.append(lazyload(FeedItem.entry))
+    return options
+
+
+def summarize(item: FeedItem, fields: Tuple[str, ...]) -> FeedItemSummary:
+    return FeedItemSummary(**{name: getattr(item, name) for name in fields})
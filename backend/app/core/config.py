@@ -10,9 +10,41 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    USER_CACHE_SIZE: int = 10000  # Authenticated users kept in memory, 0 disables the cache
+    USER_CACHE_TTL_SECONDS: int = 300  # Upper bound on how stale a cached user can be
+    
+    # Feed fetching
+    FETCH_MAX_WORKERS: int = 16  # Concurrent downloads per sweep
+    FETCH_PER_HOST_LIMIT: int = 2  # Concurrent downloads against a single host
+    PARSE_POOL_SIZE: int = 0  # Worker processes for feed parsing, 0 parses in-process
+    FETCH_CONNECT_TIMEOUT_SECONDS: float = 10  # Establishing a connection
+    FETCH_READ_TIMEOUT_SECONDS: float = 30  # Max silence waiting for the response or between chunks of its body
+    FETCH_TOTAL_TIMEOUT_SECONDS: float = 120  # Whole download, cuts off servers that trickle bytes
+    FETCH_MAX_BYTES: int = 10 * 1024 * 1024  # Largest feed document accepted, after decompression
+    FETCH_HOST_RATE_PER_SECOND: float = 2  # Sustained request rate to a single host
+    FETCH_HOST_BURST: int = 5  # Requests a host may get back to back before the rate applies
+    FETCH_MAX_HOST_WAIT_SECONDS: float = 30  # A fetch that would wait longer on its host's limit is deferred instead
+    FETCH_DNS_CACHE_SECONDS: int = 300
+    
+    # Polling schedule
+    SCHEDULER_TICK_SECONDS: int = 60  # How often the dispatcher looks for due sources
+    SCHEDULER_BATCH_SIZE: int = 500  # Max sources fetched per tick
+    POLL_MIN_INTERVAL_MINUTES: int = 10
+    POLL_DEFAULT_INTERVAL_MINUTES: int = 30  # Used until a source has a publish history
+    POLL_MAX_INTERVAL_MINUTES: int = 1440
+    SCHEDULER_ENABLED: bool = True  # Sweep inside the API process; turn off when app.worker processes fetch instead
+    SCHEDULER_LEADER_LEASE_SECONDS: int = 180  # Another API process takes over sweeping if the leader is silent this long
+    FETCH_LEASE_SECONDS: int = 300  # A claimed source is retried by another worker if not renewed within this
+    
+    # Profiling
+    SLOW_QUERY_MS: float = 250  # Statements at least this slow are logged with their plan, 0 disables
+    N_PLUS_ONE_THRESHOLD: int = 10  # Same SELECT this often in one request is logged as a likely N+1, 0 disables
     
     # Twitter API (optional)
     TWITTER_BEARER_TOKEN: Optional[str] = None
+    TWITTER_API_URL: str = "https://api.twitter.com"  # Point at a local stub of the API to test without spending quota
+    TWITTER_USER_CACHE_SECONDS: int = 86400  # How long a username's resolved user ID is reused
+    TWITTER_MAX_PAGES: int = 5  # Pages of 100 read per fetch to catch up on tweets since the last one seen
     
     # Google OAuth (optional)
     GOOGLE_CLIENT_ID: Optional[str] = None
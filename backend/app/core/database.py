@@ -1,18 +1,57 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core import profiling
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the driver in a sync database URL for its asyncio counterpart"""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 )
 
+# Used by the read endpoints so a slow query awaits instead of blocking the event loop
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL))
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
+def enable_sqlite_wal(dbapi_connection, connection_record):
+    # Let readers on one engine proceed while the other engine (or the scheduler) writes
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", enable_sqlite_wal)
+    event.listen(async_engine.sync_engine, "connect", enable_sqlite_wal)
+
+# Query timing for /metrics, per-request profiles and the slow-query log
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", profiling.before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", profiling.after_cursor_execute)
+    event.listen(_engine, "handle_error", profiling.handle_error)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -20,3 +59,21 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def insert_or_ignore(bind, model, index_elements):
+    """
+    INSERT ... ON CONFLICT (index_elements) DO NOTHING for the bind's dialect.
+    
+    Returns an insert construct; chain .values(), .from_select() or .returning() on it.
+    """
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    raise NotImplementedError(f"ON CONFLICT DO NOTHING is not supported for {dialect}")
@@ -0,0 +1,233 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers a fast SQLite lookup up to a stalled download
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    # HELP lines escape backslashes and line feeds but not quotes
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """Labelled family of samples; one child per distinct label tuple"""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def labels(self, *values):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples()]
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield f"{self.name}_total", _format_labels(self.labelnames, key), child.value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield self.name, _format_labels(self.labelnames, key), child.value
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose labelled values are read from `collect()` at scrape time"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 collect: Callable[[], Dict[Tuple[str, ...], float]], registry=None):
+        self.collect = collect
+        super().__init__(name, documentation, labelnames, registry)
+
+    def samples(self):
+        for key, value in self.collect().items():
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def time(self):
+        return self._unlabelled().time()
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(names, key + (_format_value(bound),)), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Registry:
+    """Process-wide set of metrics, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# Database
+
+# Observed by the cursor hooks in app.core.profiling
+DB_QUERY_SECONDS = Histogram(
+    "feedly_db_query_seconds", "Time spent executing SQL statements",
+    ["engine", "statement"]
+)
+
+
+def statement_kind(statement: str) -> str:
+    """First keyword of a SQL statement, e.g. SELECT"""
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "OTHER"
+
+
+# HTTP
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "feedly_http_request_seconds", "API request latency by route template",
+    ["method", "route", "status"]
+)
+
+
+def route_label(scope) -> str:
+    """The matched route's path template, so /api/items/1 and /api/items/2 share a series"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
@@ -0,0 +1,124 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy.engine import Connection
+from app.core.config import settings
+from app.core.metrics import DB_QUERY_SECONDS, statement_kind
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_PARAMETERS = 500  # Characters of bound parameters kept in a slow-query log line
+EXPLAINABLE = ("SELECT", "WITH")
+
+
+class RequestProfile:
+    """Database work done on behalf of one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.selects = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        if statement_kind(statement) in EXPLAINABLE:
+            self.selects[statement] += 1
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header"""
+        total = (time.perf_counter() - self.started) * 1000
+        return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.query_count} queries", total;dur={total:.1f}'
+
+    def repeated_selects(self, threshold: int) -> List[Tuple[str, int]]:
+        """SELECTs issued at least `threshold` times, the usual sign of a lazy load in a loop"""
+        if threshold <= 0:
+            return []
+        return [(statement, count) for statement, count in self.selects.most_common() if count >= threshold]
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def profile_request():
+    """
+    Attribute every statement run in this context to a fresh RequestProfile.
+
+    Context variables follow the request into the threadpool for sync
+    endpoints and into the greenlet for async ones, so both engines count.
+    """
+    profile = RequestProfile()
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+
+
+def report_n_plus_one(profile: RequestProfile, where: str) -> None:
+    for statement, count in profile.repeated_selects(settings.N_PLUS_ONE_THRESHOLD):
+        logger.warning(f"Possible N+1 in {where}: statement ran {count} times: {' '.join(statement.split())}")
+
+
+def explain(connection: Connection, statement: str, parameters) -> List[str]:
+    """Return the database's plan for a raw statement as a list of lines"""
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return [row[-1] for row in rows]
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+    return [row[0] for row in rows]
+
+
+def _log_slow_query(conn, statement: str, parameters, executemany: bool, seconds: float) -> None:
+    plan = []
+    if not executemany and statement_kind(statement) in EXPLAINABLE:
+        # EXPLAIN goes through the same cursor events; don't time or explain it
+        conn.info["explaining"] = True
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as e:
+            plan = [f"(EXPLAIN failed: {e})"]
+        finally:
+            conn.info["explaining"] = False
+
+    logged_parameters = repr(parameters)
+    if len(logged_parameters) > MAX_LOGGED_PARAMETERS:
+        logged_parameters = logged_parameters[:MAX_LOGGED_PARAMETERS] + "..."
+    logger.warning(
+        f"Slow query ({seconds * 1000:.1f} ms): {' '.join(statement.split())}\n"
+        f"  parameters: {logged_parameters}" + "".join(f"\n  plan: {line}" for line in plan)
+    )
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not conn.info.get("explaining"):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if conn.info.get("explaining"):
+        return
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+
+    DB_QUERY_SECONDS.labels(
+        "async" if conn.dialect.is_async else "sync", statement_kind(statement)
+    ).observe(seconds)
+
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record(statement, seconds)
+
+    if settings.SLOW_QUERY_MS > 0 and seconds * 1000 >= settings.SLOW_QUERY_MS:
+        _log_slow_query(conn, statement, parameters, executemany, seconds)
+
+
+def handle_error(exception_context):
+    # after_cursor_execute doesn't fire for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started") and not conn.info.get("explaining"):
+        conn.info["query_started"].pop()
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.metrics import CallbackGauge
+
+
+class CachedUser:
+    """Detached snapshot of the User columns endpoints read from `current_user`"""
+    __slots__ = ("id", "email", "auth_provider", "google_id", "created_at")
+
+    def __init__(self, id: int, email: str, auth_provider, google_id: Optional[str], created_at: Optional[datetime]):
+        self.id = id
+        self.email = email
+        self.auth_provider = auth_provider
+        self.google_id = google_id
+        self.created_at = created_at
+
+    @classmethod
+    def from_user(cls, user) -> "CachedUser":
+        return cls(user.id, user.email, user.auth_provider, user.google_id, user.created_at)
+
+
+class UserCache:
+    """
+    Bounded LRU cache from access token to the authenticated user.
+    
+    An entry lives until the token expires or `ttl` seconds pass, whichever
+    is first, so a cached token is never honoured past its `exp` claim.
+    Tokens are only cached after their signature has been verified.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, CachedUser]]" = OrderedDict()
+        self._tokens_by_email: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._remove(token)
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user: CachedUser, token_expires_at: Optional[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (expires_at, user)
+            self._tokens_by_email.setdefault(user.email, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, email: str) -> None:
+        """Drop every cached token for a user whose row has changed"""
+        with self._lock:
+            for token in list(self._tokens_by_email.get(email, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_email.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _remove(self, token: str) -> None:
+        _, user = self._entries.pop(token)
+        tokens = self._tokens_by_email.get(user.email)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_email[user.email]
+
+
+user_cache = UserCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+USER_CACHE_STATS = CallbackGauge(
+    "feedly_user_cache", "Authenticated user cache hits, misses and current size",
+    ["stat"], lambda: {(stat,): value for stat, value in user_cache.stats().items()}
+)
@@ -1,22 +1,38 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy import inspect
 from app.core.config import settings
 from app.core.database import engine, Base
-from app.api import auth, feeds, categories, items
+from app.core.metrics import REGISTRY, CONTENT_TYPE, HTTP_REQUEST_SECONDS, route_label
+from app.core.profiling import profile_request, report_n_plus_one
+from app.api import auth, feeds, categories, items, counts
 from app.scheduler import start_scheduler, stop_scheduler
+from app.services.parse_pool import parse_pool
+from app.services.search_index import ensure_search_index
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# A fresh database is created at the latest schema; existing ones are upgraded with Alembic
+tables = inspect(engine).get_table_names()
+if not tables:
+    Base.metadata.create_all(bind=engine)
+elif "feed_sources" not in tables:
+    raise RuntimeError(
+        "The database predates migrations. From backend/, run `alembic stamp 0001` "
+        "and then `alembic upgrade head`."
+    )
+ensure_search_index(engine)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    start_scheduler()
+    if settings.SCHEDULER_ENABLED:
+        start_scheduler()
     yield
     # Shutdown
     stop_scheduler()
+    parse_pool.shutdown()
 
 app = FastAPI(title="Feedly Feed Aggregator", version="1.0.0", lifespan=lifespan)
 
@@ -29,11 +45,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.labels(
+            request.method, route_label(request.scope), status_code
+        ).observe(time.perf_counter() - started)
+
+
+@app.middleware("http")
+async def profile_database(request: Request, call_next):
+    """Report the request's query count and DB time in Server-Timing and log N+1 patterns"""
+    with profile_request() as profile:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = profile.server_timing()
+    report_n_plus_one(profile, f"{request.method} {route_label(request.scope)}")
+    return response
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(feeds.router)
 app.include_router(categories.router)
 app.include_router(items.router)
+app.include_router(counts.router)
 
 @app.get("/")
 def root():
@@ -43,3 +84,7 @@ def root():
 def health():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape target"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
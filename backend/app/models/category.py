@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -19,6 +19,11 @@ class Category(Base):
     assignments = relationship("CategoryAssignment", back_populates="category", cascade="all, delete-orphan")
     feeds = relationship("Feed", foreign_keys="Feed.category_id", back_populates="category", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_categories_user_id", "user_id"),
+        Index("ix_categories_parent_id", "parent_id"),
+    )
+
 
 class CategoryAssignment(Base):
     __tablename__ = "category_assignments"
@@ -32,3 +37,8 @@ class CategoryAssignment(Base):
     category = relationship("Category", back_populates="assignments")
     feed_item = relationship("FeedItem", back_populates="category_assignments")
 
+    __table_args__ = (
+        Index("ix_category_assignments_category_id", "category_id"),
+        Index("ix_category_assignments_feed_item_id", "feed_item_id"),
+    )
+
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, LargeBinary, Enum as SQLEnum
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Optional
 import enum
+import zlib
 from app.core.database import Base
 
 
@@ -10,38 +13,148 @@ class FeedType(str, enum.Enum):
     TWITTER = "twitter"
 
 
+class FeedSource(Base):
+    """A unique upstream feed, fetched once no matter how many users subscribe to it"""
+    __tablename__ = "feed_sources"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, nullable=False, unique=True, index=True)  # Normalized URL, twitter:// for Twitter
+    feed_type = Column(SQLEnum(FeedType), nullable=False)
+    config = Column(JSON, default={})
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_fetched_at = Column(DateTime, nullable=True)
+    # HTTP cache validators from the last successful fetch, sent back as a conditional GET
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    last_status = Column(Integer, nullable=True)  # HTTP status of the last fetch
+    # Adaptive polling state
+    next_fetch_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Due on creation
+    poll_interval = Column(Integer, nullable=True)  # Seconds, as last computed
+    update_interval = Column(Integer, nullable=True)  # Seconds, from <ttl> / sy:updatePeriod
+    error_count = Column(Integer, default=0, nullable=False)  # Consecutive failed fetches
+    last_error = Column(Text, nullable=True)
+    # Fetch lease: the worker holding the source, until lease_expires_at passes
+    lease_owner = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    since_id = Column(String(32), nullable=True)  # Newest tweet ID stored, Twitter sources only
+
+    # Relationships
+    subscriptions = relationship("Feed", back_populates="source")
+    entries = relationship("SourceEntry", back_populates="source", cascade="all, delete-orphan")
+
+
+class ContentBlob(Base):
+    """A zlib-compressed article body, stored once per distinct text and keyed by its SHA-256"""
+    __tablename__ = "content_blobs"
+
+    hash = Column(String(64), primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # Uncompressed length in bytes
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.data).decode("utf-8")
+
+
+class SourceEntry(Base):
+    """An article as published by a source, stored once and shared by every subscriber"""
+    __tablename__ = "source_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_id = Column(Integer, ForeignKey("feed_sources.id"), nullable=False)
+    title = Column(String, nullable=False)
+    # Full HTML body lives out of row in content_blobs; lists show the excerpt
+    content_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=True)
+    excerpt = Column(String, nullable=True)
+    url = Column(String, nullable=False)
+    published_at = Column(DateTime, nullable=True)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    source = relationship("FeedSource", back_populates="entries")
+    blob = relationship("ContentBlob")
+
+    __table_args__ = (
+        # Dedupe key for ingest
+        Index("uq_source_entries_source_url", "source_id", "url", unique=True),
+        # Recent-entries sample for the polling schedule
+        Index("ix_source_entries_source_published", "source_id", "published_at"),
+        # Reference check when purging blobs
+        Index("ix_source_entries_content_hash", "content_hash"),
+    )
+
+    @property
+    def content(self) -> Optional[str]:
+        """Decompressed body. Loads `blob` if it isn't already, so async callers must eager-load it"""
+        return self.blob.text if self.blob is not None else None
+
+
 class Feed(Base):
+    """A user's subscription to a FeedSource"""
     __tablename__ = "feeds"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)  # Optional category
+    source_id = Column(Integer, ForeignKey("feed_sources.id"), nullable=False)
     name = Column(String, nullable=False)
     url = Column(String, nullable=False)
     feed_type = Column(SQLEnum(FeedType), nullable=False)
     config = Column(JSON, default={})  # For Twitter API config, RSS options, etc.
     created_at = Column(DateTime, default=datetime.utcnow)
-    last_fetched_at = Column(DateTime, nullable=True)
+    # Maintained by app.services.counters
+    item_count = Column(Integer, default=0, nullable=False)
+    unread_count = Column(Integer, default=0, nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="feeds")
     category = relationship("Category", foreign_keys=[category_id])
+    source = relationship("FeedSource", back_populates="subscriptions")
     items = relationship("FeedItem", back_populates="feed", cascade="all, delete-orphan")
 
+    last_fetched_at = association_proxy("source", "last_fetched_at")
+
+    __table_args__ = (
+        Index("ix_feeds_user_id", "user_id"),
+        Index("ix_feeds_source_id", "source_id"),
+        Index("ix_feeds_category_id", "category_id"),
+    )
+
 
 class FeedItem(Base):
+    """A user's copy of a SourceEntry: per-user state only, article data lives on the entry"""
     __tablename__ = "feed_items"
 
     id = Column(Integer, primary_key=True, index=True)
     feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=False)
-    title = Column(String, nullable=False)
-    content = Column(Text, nullable=True)
-    url = Column(String, nullable=False)
-    published_at = Column(DateTime, nullable=True)
+    # Copied from the feed so a user's items can be listed without visiting each feed
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entry_id = Column(Integer, ForeignKey("source_entries.id"), nullable=False)
+    published_at = Column(DateTime, nullable=True)  # Copied from the entry for sorting, fetch time if undated
     fetched_at = Column(DateTime, default=datetime.utcnow)
     read_at = Column(DateTime, nullable=True)
 
     # Relationships
     feed = relationship("Feed", back_populates="items")
+    entry = relationship("SourceEntry", lazy="joined", innerjoin=True)
     category_assignments = relationship("CategoryAssignment", back_populates="feed_item", cascade="all, delete-orphan")
 
+    title = association_proxy("entry", "title")
+    content = association_proxy("entry", "content")
+    excerpt = association_proxy("entry", "excerpt")
+    url = association_proxy("entry", "url")
+
+    __table_args__ = (
+        # Listing order for a feed, matching the pagination cursor
+        Index("ix_feed_items_feed_published", "feed_id", published_at.desc(), id.desc()),
+        # Listing order across all of a user's feeds
+        Index("ix_feed_items_user_published", "user_id", published_at.desc(), id.desc()),
+        # One copy of an entry per subscription
+        Index("uq_feed_items_feed_entry", "feed_id", "entry_id", unique=True),
+        # Unread listings only touch unread rows
+        Index(
+            "ix_feed_items_unread", "feed_id", published_at.desc(), id.desc(),
+            sqlite_where=read_at.is_(None),
+            postgresql_where=read_at.is_(None)
+        ),
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+from app.core.database import Base
+
+
+class LeaderLease(Base):
+    """Which process currently holds a singleton role, such as running the scheduler"""
+    __tablename__ = "leader_leases"
+
+    name = Column(String(64), primary_key=True)
+    holder = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
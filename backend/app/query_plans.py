@@ -0,0 +1,197 @@
+"""
+Print query plans for the main read endpoints and flag full table scans.
+
+Runs each endpoint against a small seeded database, captures the SQL it
+issues and EXPLAINs every SELECT. Exits non-zero if a hot table is read
+without an index, so a dropped or unusable index shows up in CI:
+
+    python -m app.query_plans
+    python -m app.query_plans --database-url postgresql://localhost/feedly_plans
+
+The target database is created and seeded from scratch; never point this
+at production data.
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.database import Base, async_database_url
+from app.core.profiling import explain
+from app.core.security import create_access_token
+from app.core.user_cache import CachedUser, user_cache
+from app.models.user import User
+from app.models.feed import Feed, FeedItem, FeedSource, FeedType, SourceEntry
+from app.models.category import Category, CategoryAssignment
+from app.api import items, feeds, categories, counts
+from app.api.dependencies import get_current_user
+from app.api.pagination import encode_cursor
+from app.services.content_store import store_contents
+from app.services.search_index import create_search_index, drop_search_index, index_entries
+
+# Tables that grow with content; reading one of these without an index is a regression
+HOT_TABLES = ("feed_items", "source_entries", "content_blobs", "category_assignments")
+
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (%s)\b(?! USING)" % "|".join(HOT_TABLES))
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (%s)\b" % "|".join(HOT_TABLES))
+
+
+@contextmanager
+def capture_statements(engine: Engine):
+    """Collect (statement, parameters) for every SELECT, plain or with a CTE, run on the engine"""
+    captured: List[Tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(dialect: str, plan: List[str]) -> List[str]:
+    pattern = SQLITE_FULL_SCAN if dialect == "sqlite" else POSTGRES_FULL_SCAN
+    return [line for line in plan if pattern.search(line)]
+
+
+def seed(db: Session) -> dict:
+    """Create one user with a category, a categorized feed and an assigned item"""
+    now = datetime.utcnow()
+    user = User(email="plans@example.com")
+    db.add(user)
+    db.flush()
+    category = Category(user_id=user.id, name="News")
+    source = FeedSource(url="https://example.com/feed.xml", feed_type=FeedType.RSS, config={})
+    db.add_all([category, source])
+    db.flush()
+    feed = Feed(
+        user_id=user.id, category_id=category.id, source_id=source.id, name="Example",
+        url=source.url, feed_type=FeedType.RSS, config={}
+    )
+    db.add(feed)
+    db.flush()
+    body = "<p>Body</p>"
+    hashes = store_contents(db, [body])
+    for i in range(20):
+        entry = SourceEntry(
+            source_id=source.id, title=f"Entry {i}", content_hash=hashes[body], excerpt="Body",
+            url=f"https://example.com/{i}", published_at=now - timedelta(hours=i), fetched_at=now
+        )
+        db.add(entry)
+        db.flush()
+        db.add(FeedItem(feed_id=feed.id, user_id=user.id, entry_id=entry.id, published_at=entry.published_at, fetched_at=now))
+        index_entries(db, [(entry.id, entry.title, body)])
+    db.flush()
+    first_item = db.query(FeedItem).filter(FeedItem.feed_id == feed.id).first()
+    db.add(CategoryAssignment(category_id=category.id, feed_item_id=first_item.id))
+    db.commit()
+    return {
+        "token": create_access_token({"sub": user.email}),
+        "category_id": category.id,
+        "feed_id": feed.id,
+        "item_id": first_item.id,
+        "cursor": encode_cursor(first_item),
+    }
+
+
+def endpoint_calls(db: AsyncSession, user: CachedUser, fixtures: dict):
+    """(name, coroutine function) pairs exercising the read endpoints the way the API does"""
+    category_id, feed_id, item_id = fixtures["category_id"], fixtures["feed_id"], fixtures["item_id"]
+    list_args = dict(category_id=None, include_subcategories=False, feed_id=None, unread_only=False, since_date=None, cursor=None, limit=50, fields=None)
+    search_args = dict(category_id=None, include_subcategories=False, feed_id=None, since_date=None, cursor=None, limit=50, fields=None)
+    return [
+        ("auth", lambda: get_current_user(token=fixtures["token"], db=db)),
+        ("GET /api/items", lambda: items.get_all_items(**list_args, current_user=user, db=db)),
+        ("GET /api/items?cursor", lambda: items.get_all_items(
+            **dict(list_args, cursor=fixtures["cursor"]), current_user=user, db=db
+        )),
+        ("GET /api/items?unread_only", lambda: items.get_all_items(**dict(list_args, unread_only=True), current_user=user, db=db)),
+        ("GET /api/items?feed_id", lambda: items.get_all_items(**dict(list_args, feed_id=feed_id), current_user=user, db=db)),
+        ("GET /api/items?category_id", lambda: items.get_all_items(**dict(list_args, category_id=category_id), current_user=user, db=db)),
+        ("GET /api/items?category_id&include_subcategories", lambda: items.get_all_items(
+            **dict(list_args, category_id=category_id, include_subcategories=True), current_user=user, db=db
+        )),
+        ("GET /api/feeds/{id}/items", lambda: feeds.get_feed_items(feed_id, cursor=None, limit=50, fields=None, current_user=user, db=db)),
+        ("GET /api/categories/{id}/items", lambda: categories.get_category_items(
+            category_id, since_date=None, include_subcategories=False, cursor=None, limit=50, fields=None,
+            current_user=user, db=db
+        )),
+        ("GET /api/items/search", lambda: items.search_items("entry", **search_args, current_user=user, db=db)),
+        ("GET /api/items/search?category_id", lambda: items.search_items(
+            "entry", **dict(search_args, category_id=category_id), current_user=user, db=db
+        )),
+        ("GET /api/items/{id}", lambda: items.get_item(item_id, current_user=user, db=db)),
+        ("GET /api/counts", lambda: counts.get_counts(current_user=user, db=db)),
+    ]
+
+
+async def capture_endpoints(async_engine: AsyncEngine, fixtures: dict) -> List[Tuple[str, list]]:
+    """Run every endpoint once and return the SELECTs each one issued"""
+    captured = []
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        user = await get_current_user(token=fixtures["token"], db=db)
+        # Make the "auth" call below a cache miss so its query is captured
+        user_cache.clear()
+        for name, call in endpoint_calls(db, user, fixtures):
+            with capture_statements(async_engine.sync_engine) as statements:
+                await call()
+            captured.append((name, list(statements)))
+    await async_engine.dispose()
+    return captured
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Scratch database (default: a temporary SQLite file)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = args.database_url or f"sqlite:///{os.path.join(scratch, 'plans.db')}"
+        engine = create_engine(database_url)
+        with engine.begin() as connection:
+            drop_search_index(connection)
+            Base.metadata.drop_all(bind=connection)
+            Base.metadata.create_all(bind=connection)
+            create_search_index(connection)
+        with sessionmaker(bind=engine)() as db:
+            fixtures = seed(db)
+
+        captured = asyncio.run(capture_endpoints(create_async_engine(async_database_url(database_url)), fixtures))
+
+        regressions = []
+        with engine.connect() as connection:
+            if engine.dialect.name == "postgresql":
+                # Tiny tables favour seq scans; forbid them to see whether an index can serve each query
+                connection.exec_driver_sql("SET enable_seqscan = off")
+            for name, statements in captured:
+                print(f"== {name}")
+                for statement, parameters in statements:
+                    plan = explain(connection, statement, parameters)
+                    print("   " + " ".join(statement.split()))
+                    for line in plan:
+                        print(f"     {line}")
+                    regressions += [(name, line) for line in full_scans(engine.dialect.name, plan)]
+        engine.dispose()
+
+    if regressions:
+        print("\nFull scans of hot tables:")
+        for name, line in regressions:
+            print(f"  {name}: {line.strip()}")
+        return 1
+    print("\nNo full scans of hot tables.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,39 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import SessionLocal
+from app.core.metrics import Histogram
 from app.services.feed_fetcher import FeedFetcher
+from app.services.leader import LeaderHeartbeat, Leadership
 import logging
 
 logger = logging.getLogger(__name__)
 
 scheduler = BackgroundScheduler()
 
+SWEEP_SECONDS = Histogram("feedly_sweep_seconds", "Duration of a scheduler sweep over due sources")
 
-def fetch_all_feeds_job():
-    """Background job to fetch all feeds"""
+# Every app process runs the scheduler, but only the one holding this lease sweeps
+leadership = Leadership("scheduler", settings.SCHEDULER_LEADER_LEASE_SECONDS)
+
+
+def fetch_due_feeds_job():
+    """Background job to fetch the sources that are due, on the leader only"""
     db: Session = SessionLocal()
     try:
+        if not leadership.acquire(db):
+            return
         fetcher = FeedFetcher(db)
-        results = fetcher.fetch_all_feeds()
-        logger.info(f"Feed fetch job completed. Results: {results}")
+        # A sweep can outlast the lease; it stops early if leadership is lost
+        with LeaderHeartbeat(leadership, SessionLocal) as heartbeat, SWEEP_SECONDS.time():
+            results = fetcher.fetch_due_feeds(
+                limit=settings.SCHEDULER_BATCH_SIZE, worker_id=leadership.holder, keep_going=heartbeat.held
+            )
+        if results:
+            failed = sum(1 for result in results.values() if not result['success'])
+            new_items = sum(result.get('new_items', 0) for result in results.values())
+            logger.info(f"Feed fetch job completed. Sources: {len(results)}, failed: {failed}, new items: {new_items}")
     except Exception as e:
         logger.error(f"Error in feed fetch job: {str(e)}")
     finally:
@@ -26,13 +43,15 @@ def fetch_all_feeds_job():
 def start_scheduler():
     """Start the background scheduler"""
     if not scheduler.running:
-        # Run every 30 minutes
+        # Short tick; each source carries its own next_fetch_at
         scheduler.add_job(
-            fetch_all_feeds_job,
-            trigger=IntervalTrigger(minutes=30),
-            id='fetch_all_feeds',
-            name='Fetch all feeds',
-            replace_existing=True
+            fetch_due_feeds_job,
+            trigger=IntervalTrigger(seconds=settings.SCHEDULER_TICK_SECONDS),
+            id='fetch_due_feeds',
+            name='Fetch due feeds',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
         scheduler.start()
         logger.info("Scheduler started")
@@ -42,5 +61,12 @@ def stop_scheduler():
     """Stop the background scheduler"""
     if scheduler.running:
         scheduler.shutdown()
+        if leadership.is_leader:
+            db: Session = SessionLocal()
+            try:
+                leadership.release(db)
+            except Exception as e:
+                logger.error(f"Error releasing scheduler leadership: {str(e)}")
+            finally:
+                db.close()
         logger.info("Scheduler stopped")
-
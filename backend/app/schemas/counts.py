@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ItemCounts(BaseModel):
+    id: int
+    item_count: int
+    unread_count: int
+
+
+class CountsResponse(BaseModel):
+    feeds: List[ItemCounts]
+    categories: List[ItemCounts]  # Rolled up over each category's feeds and subcategories
+    item_count: int
+    unread_count: int
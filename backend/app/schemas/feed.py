@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from app.models.feed import FeedType
 
 
@@ -28,6 +28,8 @@ class FeedResponse(FeedBase):
     category_id: Optional[int] = None
     created_at: datetime
     last_fetched_at: Optional[datetime] = None
+    item_count: int = 0
+    unread_count: int = 0
 
     class Config:
         from_attributes = True
@@ -43,6 +45,7 @@ class FeedItemBase(BaseModel):
 class FeedItemResponse(FeedItemBase):
     id: int
     feed_id: int
+    excerpt: Optional[str] = None
     fetched_at: datetime
     read_at: Optional[datetime] = None
 
@@ -50,6 +53,36 @@ class FeedItemResponse(FeedItemBase):
         from_attributes = True
 
 
+class FeedItemSummary(BaseModel):
+    """List view of an item. Only the requested fields are set; content is opt-in"""
+    id: int
+    feed_id: Optional[int] = None
+    title: Optional[str] = None
+    url: Optional[str] = None
+    excerpt: Optional[str] = None
+    content: Optional[str] = None
+    published_at: Optional[datetime] = None
+    fetched_at: Optional[datetime] = None
+    read_at: Optional[datetime] = None
+
+
+class FeedItemPage(BaseModel):
+    items: List[FeedItemSummary]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page
+
+
 class FeedItemUpdate(BaseModel):
     read_at: Optional[datetime] = None
 
+
+class BulkMarkRead(BaseModel):
+    """Which items to mark read. Filters combine; an empty body marks everything read"""
+    feed_id: Optional[int] = None
+    category_id: Optional[int] = None
+    include_subcategories: bool = False
+    before: Optional[datetime] = None  # Only items published before this time
+    item_ids: Optional[List[int]] = Field(None, max_length=1000)
+
+
+class BulkMarkReadResponse(BaseModel):
+    updated: int
@@ -0,0 +1,68 @@
+"""
+Category hierarchy queries.
+
+Subtrees are resolved in the database with a recursive CTE, and item
+membership is expressed as subqueries, so neither the category ids nor the
+assigned item ids ever make a round trip through Python.
+"""
+from typing import Dict, List, Optional
+from sqlalchemy import ColumnElement, Select, select, union
+from app.models.category import Category, CategoryAssignment
+from app.models.feed import Feed, FeedItem
+from app.schemas.category import CategoryResponse
+
+
+def category_subtree(category_id: int) -> Select:
+    """Select the ids of a category and all of its descendants"""
+    tree = select(Category.id).where(Category.id == category_id).cte("category_tree", recursive=True)
+    # UNION rather than UNION ALL: it drops rows already seen, so a cycle in
+    # parent_id ends the recursion instead of looping forever
+    tree = tree.union(select(Category.id).where(Category.parent_id == tree.c.id))
+    return select(tree.c.id)
+
+
+def category_scope(category_id: int, include_subcategories: bool = False):
+    """The category itself, or a subquery over its whole subtree"""
+    return category_subtree(category_id) if include_subcategories else [category_id]
+
+
+def items_in_categories(category_ids) -> ColumnElement:
+    """
+    Condition matching items in any of `category_ids` (a list or a select):
+    the union of items from feeds filed there and items assigned there.
+    """
+    return FeedItem.id.in_(union(
+        select(FeedItem.id).where(FeedItem.feed_id.in_(select(Feed.id).where(Feed.category_id.in_(category_ids)))),
+        select(CategoryAssignment.feed_item_id).where(CategoryAssignment.category_id.in_(category_ids))
+    ))
+
+
+def index_category_tree(categories: List[Category]) -> Dict[int, CategoryResponse]:
+    """
+    Build one response node per category and hang each under its parent.
+    
+    A single pass over a parent -> children index, so cost is linear in the
+    number of categories however they are nested.
+    """
+    nodes = {
+        category.id: CategoryResponse(
+            # Read columns only; the lazy `children` backref can't load on an async session
+            id=category.id,
+            user_id=category.user_id,
+            name=category.name,
+            parent_id=category.parent_id,
+            created_at=category.created_at,
+            children=[]
+        )
+        for category in categories
+    }
+    for node in nodes.values():
+        parent = nodes.get(node.parent_id)
+        if parent is not None:
+            parent.children.append(node)
+    return nodes
+
+
+def build_category_tree(categories: List[Category], parent_id: Optional[int] = None) -> List[CategoryResponse]:
+    """Build hierarchical category tree"""
+    return [node for node in index_category_tree(categories).values() if node.parent_id == parent_id]
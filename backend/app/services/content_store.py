@@ -0,0 +1,65 @@
+"""
+Content-addressed storage for article bodies.
+
+Bodies are zlib-compressed into content_blobs, keyed by the SHA-256 of the
+text, so identical bodies (syndicated posts, the same article in several
+sources) are stored once and feed_items / source_entries rows stay small.
+"""
+import hashlib
+import zlib
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.database import insert_or_ignore
+from app.models.feed import ContentBlob, SourceEntry
+
+COMPRESSION_LEVEL = 6
+INSERT_BATCH_SIZE = 300  # Three parameters per row
+LOOKUP_BATCH_SIZE = 500
+PURGE_BATCH_SIZE = 400  # Hashes per DELETE; each is bound twice
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def store_contents(db: Session, texts: Iterable[Optional[str]]) -> Dict[str, str]:
+    """
+    Write the distinct non-empty bodies in `texts` that aren't stored yet.
+    
+    Hashing is cheap; compression only runs for bodies the store has never
+    seen, so re-fetching an unchanged document costs one lookup per batch.
+    
+    Returns:
+        Dictionary mapping each body to its content hash
+    """
+    hashes = {text: content_hash(text) for text in texts if text}
+    digests = list(set(hashes.values()))
+    existing = set()
+    for start in range(0, len(digests), LOOKUP_BATCH_SIZE):
+        existing.update(db.scalars(select(ContentBlob.hash).filter(
+            ContentBlob.hash.in_(digests[start:start + LOOKUP_BATCH_SIZE])
+        )))
+    
+    rows = {}
+    for text, digest in hashes.items():
+        if digest not in existing and digest not in rows:
+            raw = text.encode("utf-8")
+            rows[digest] = {"hash": digest, "data": zlib.compress(raw, COMPRESSION_LEVEL), "size": len(raw)}
+    rows = list(rows.values())
+    # ON CONFLICT covers a concurrent writer storing the same body
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert_or_ignore(db.get_bind(), ContentBlob, ["hash"]).values(rows[start:start + INSERT_BATCH_SIZE]))
+    return hashes
+
+
+def purge_contents(db: Session, hashes: Iterable[str]) -> None:
+    """Delete the given blobs that no entry references any more"""
+    hashes = list(set(hashes))
+    for start in range(0, len(hashes), PURGE_BATCH_SIZE):
+        batch = hashes[start:start + PURGE_BATCH_SIZE]
+        referenced = select(SourceEntry.content_hash).filter(SourceEntry.content_hash.in_(batch))
+        db.query(ContentBlob).filter(
+            ContentBlob.hash.in_(batch),
+            ContentBlob.hash.not_in(referenced)
+        ).delete(synchronize_session=False)
@@ -0,0 +1,63 @@
+"""
+Per-feed item and unread counters.
+
+Feed.item_count and Feed.unread_count are kept in step with feed_items by
+every write path, so badges are read from feeds instead of counting items.
+Category totals are rolled up from the feeds, plus items assigned to the
+categories, at read time.
+"""
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy.orm import Session
+from app.models.feed import Feed, FeedItem
+
+
+def count_new_items(db: Session, feed_ids: Iterable[int]) -> None:
+    """
+    Credit a new, unread item once per entry in `feed_ids`, as returned by
+    the insert that added them. Feeds credited alike share one UPDATE, so a
+    source's new entries cost one statement however many subscribe to it.
+    """
+    by_added = defaultdict(list)
+    for feed_id, added in Counter(feed_ids).items():
+        by_added[added].append(feed_id)
+    for added, same in by_added.items():
+        db.query(Feed).filter(Feed.id.in_(same)).update({
+            Feed.item_count: Feed.item_count + added,
+            Feed.unread_count: Feed.unread_count + added
+        }, synchronize_session=False)
+
+
+def set_read_state(db: Session, item: FeedItem, read_at: Optional[datetime]) -> None:
+    """
+    Mark `item` read at `read_at`, or unread if it is None, adjusting its
+    feed's unread_count only when the state actually flips.
+    
+    The flip is a conditional UPDATE, so two requests racing on the same
+    item can't both count it.
+    """
+    was = FeedItem.read_at.is_(None) if read_at is not None else FeedItem.read_at.isnot(None)
+    flipped = db.query(FeedItem).filter(FeedItem.id == item.id, was).update(
+        {FeedItem.read_at: read_at}, synchronize_session=False
+    )
+    if flipped:
+        db.query(Feed).filter(Feed.id == item.feed_id).update(
+            {Feed.unread_count: Feed.unread_count + (1 if read_at is None else -1)},
+            synchronize_session=False
+        )
+    elif read_at is not None:
+        # Already read; only the timestamp moves
+        db.query(FeedItem).filter(FeedItem.id == item.id).update(
+            {FeedItem.read_at: read_at}, synchronize_session=False
+        )
+
+
+def count_read(db: Session, feed_ids: Iterable[int]) -> None:
+    """Debit unread_count once per entry in `feed_ids`, as returned by a bulk mark-read"""
+    for feed_id, read in Counter(feed_ids).items():
+        db.query(Feed).filter(Feed.id == feed_id).update(
+            {Feed.unread_count: Feed.unread_count - read},
+            synchronize_session=False
+        )
+
@@ -1,93 +1,128 @@
+import logging
+import time
+from collections import defaultdict
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import Optional
-from app.models.feed import Feed, FeedItem, FeedType
-from app.services.rss_service import parse_rss_feed
-from app.services.twitter_service import get_twitter_service, TwitterService
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.models.feed import Feed, FeedSource, FeedType, SourceEntry
+from app.core.database import insert_or_ignore
+from app.core.metrics import Gauge, Histogram, COUNT_BUCKETS
+from app.services.fetch_engine import FetchEngine, host_of
+from app.services.content_store import store_contents
+from app.services.feed_sources import add_entries_to_feeds
+from app.services.fetch_queue import LeaseHeartbeat, claim_due_sources, new_worker_id, release_lease
+from app.services.http_client import RetryAfter
+from app.services.poll_schedule import poll_interval, next_due
+from app.services.rss_service import fetch_rss_feed
+from app.services.search_index import index_entries
+from app.services.text import make_excerpt
+from app.services.twitter_budget import BudgetExhausted, twitter_budget
+from app.services.twitter_service import get_twitter_service, twitter_endpoint, TwitterService
+
+logger = logging.getLogger(__name__)
+
+TWITTER_API_HOST = "api.twitter.com"
+RATE_SAMPLE_SIZE = 10  # Recent entries used to estimate a source's publish rate
+INSERT_BATCH_SIZE = 500  # Rows per multi-row INSERT, well under SQLite's bound-parameter limit
+
+FETCH_SECONDS = Histogram(
+    "feedly_fetch_seconds", "Per-source fetch latency, download plus parse",
+    ["feed_type", "outcome"]
+)
+ITEMS_INSERTED = Histogram(
+    "feedly_items_inserted", "New entries stored per fetched document", buckets=COUNT_BUCKETS
+)
+DUE_SOURCES = Gauge("feedly_due_sources", "Sources past their next_fetch_at when the last sweep started")
 
 
 class FeedFetcher:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, engine: Optional[FetchEngine] = None):
         self.db = db
         self.twitter_service: Optional[TwitterService] = get_twitter_service()
+        self.engine = engine or FetchEngine()
+        # Set while fetching sources this fetcher leased, see fetch_due_feeds
+        self.worker_id: Optional[str] = None
     
     def fetch_feed(self, feed: Feed) -> int:
         """
-        Fetch items for a given feed and store them in the database.
+        Fetch the source behind a feed and store new items for all of its subscribers.
+        
+        Returns:
+            Number of new items added to this feed
+        """
+        return self.fetch_source(feed.source).get(feed.id, 0)
+    
+    def fetch_source(self, source: FeedSource) -> Dict[int, int]:
+        """
+        Fetch a source once and fan new entries out to its subscriptions.
         
         Returns:
-            Number of new items added
+            Dictionary mapping subscribed feed_id to number of new items
         """
         try:
-            if feed.feed_type == FeedType.RSS:
-                items_data = parse_rss_feed(feed.url)
-            elif feed.feed_type == FeedType.TWITTER:
-                if not self.twitter_service:
-                    raise Exception("Twitter service not configured")
-                
-                # Twitter config can specify username or hashtag
-                config = feed.config or {}
-                if 'username' in config:
-                    items_data = self.twitter_service.get_user_tweets(
-                        config['username'],
-                        max_results=config.get('max_results', 10)
-                    )
-                elif 'hashtag' in config:
-                    items_data = self.twitter_service.search_hashtag(
-                        config['hashtag'],
-                        max_results=config.get('max_results', 10)
-                    )
-                else:
-                    raise Exception("Twitter feed config must specify 'username' or 'hashtag'")
-            else:
-                raise Exception(f"Unsupported feed type: {feed.feed_type}")
-            
-            # Get existing URLs to avoid duplicates
-            existing_items = self.db.query(FeedItem.url).filter(FeedItem.feed_id == feed.id).all()
-            existing_urls = {item[0] for item in existing_items}
-            
-            # Add new items
-            new_count = 0
-            for item_data in items_data:
-                if item_data['url'] not in existing_urls:
-                    feed_item = FeedItem(
-                        feed_id=feed.id,
-                        title=item_data['title'],
-                        content=item_data.get('content'),
-                        url=item_data['url'],
-                        published_at=item_data.get('published_at'),
-                        fetched_at=datetime.utcnow()
-                    )
-                    self.db.add(feed_item)
-                    new_count += 1
-            
-            # Update feed's last_fetched_at
-            feed.last_fetched_at = datetime.utcnow()
-            self.db.commit()
-            
-            return new_count
+            result = self._download(
+                source.feed_type, source.url, source.config or {}, source.etag, source.last_modified, source.since_id
+            )
+            return self._store_items(source, result)
+        except BudgetExhausted as e:
+            self.db.rollback()
+            self._defer(source, datetime.utcfromtimestamp(e.reset_at))
+            return {}
         except Exception as e:
             self.db.rollback()
-            raise Exception(f"Error fetching feed {feed.id}: {str(e)}")
+            self._record_failure(source, e)
+            raise Exception(f"Error fetching source {source.id}: {str(e)}")
     
     def fetch_all_feeds(self) -> dict:
         """
-        Fetch all feeds in the database.
+        Fetch every source that has at least one subscriber.
         
         Returns:
-            Dictionary mapping feed_id to number of new items
+            Dictionary mapping source_id to fetch result
         """
-        feeds = self.db.query(Feed).all()
-        results = {}
+        sources = self.db.query(FeedSource).filter(FeedSource.subscriptions.any()).all()
+        return self._summarize(self._fetch_many(sources))
+    
+    def fetch_due_feeds(
+        self,
+        limit: Optional[int] = None,
+        worker_id: Optional[str] = None,
+        keep_going: Optional[Callable[[], bool]] = None
+    ) -> dict:
+        """
+        Claim subscribed sources whose next_fetch_at has passed, most overdue
+        first, and fetch them.
         
-        for feed in feeds:
-            try:
-                new_count = self.fetch_feed(feed)
-                results[feed.id] = {'success': True, 'new_items': new_count}
-            except Exception as e:
-                results[feed.id] = {'success': False, 'error': str(e)}
+        The next_fetch_at index serves as the priority queue, so each tick
+        reads only the head of it. Claims are leases kept alive by a
+        heartbeat, so API processes and app.worker processes can sweep at
+        the same time without fetching a source twice.
         
-        return results
+        `keep_going` is checked as each result arrives; once it returns False
+        the sweep stops and sources not yet stored are released.
+        
+        Returns:
+            Dictionary mapping source_id to fetch result
+        """
+        DUE_SOURCES.set(self.db.query(func.count(FeedSource.id)).filter(
+            FeedSource.subscriptions.any(),
+            FeedSource.next_fetch_at <= datetime.utcnow()
+        ).scalar())
+        
+        worker_id = worker_id or new_worker_id()
+        claimed = claim_due_sources(self.db, worker_id, limit)
+        if not claimed:
+            return {}
+        bind = self.db.get_bind()
+        with LeaseHeartbeat(worker_id, lambda: Session(bind)):
+            sources = self.db.query(FeedSource).filter(FeedSource.id.in_(claimed)).order_by(FeedSource.next_fetch_at).all()
+            self.worker_id = worker_id
+            try:
+                return self._summarize(self._fetch_many(sources, keep_going))
+            finally:
+                self.worker_id = None
     
     def fetch_user_feeds(self, user_id: int) -> dict:
         """
@@ -97,14 +132,323 @@ class FeedFetcher:
             Dictionary mapping feed_id to number of new items
         """
         feeds = self.db.query(Feed).filter(Feed.user_id == user_id).all()
-        results = {}
+        sources = {feed.source_id: feed.source for feed in feeds}
+        outcomes = {source_id: (counts, error) for source_id, counts, error in self._fetch_many(list(sources.values()))}
         
+        results = {}
         for feed in feeds:
+            counts, error = outcomes[feed.source_id]
+            if error is None:
+                results[feed.id] = {'success': True, 'new_items': counts.get(feed.id, 0)}
+            else:
+                results[feed.id] = {'success': False, 'error': error}
+        return results
+    
+    @staticmethod
+    def _summarize(outcomes) -> dict:
+        """Collapse `_fetch_many` output into per-source result dictionaries"""
+        return {
+            source_id: ({'success': True, 'new_items': sum(counts.values())} if error is None
+                        else {'success': False, 'error': error})
+            for source_id, counts, error in outcomes
+        }
+    
+    def _fetch_many(self, sources: List[FeedSource], keep_going: Optional[Callable[[], bool]] = None):
+        """
+        Download sources concurrently and store the results as they arrive.
+        
+        Network I/O runs on the engine's worker threads and never touches the
+        session; every database write happens here, in the calling thread.
+        Stops before storing the next result once `keep_going` returns False;
+        downloads already running finish, queued ones never start.
+        
+        Yields:
+            `(source_id, counts, error)` where counts maps feed_id to new items
+        """
+        sources, deferred = self._budget_twitter(sources)
+        for source, retry_at in deferred:
+            self._defer(source, retry_at)
+            yield source.id, {}, None
+        
+        sources_by_id = {source.id: source for source in sources}
+        self._resolve_twitter_users(sources)
+        jobs = []
+        for source in sources:
+            # Snapshot plain values so workers never lazy-load through the session
+            args = (
+                source.feed_type, source.url, dict(source.config or {}),
+                source.etag, source.last_modified, source.since_id
+            )
+            host = TWITTER_API_HOST if source.feed_type == FeedType.TWITTER else host_of(source.url)
+            jobs.append((source.id, host, lambda args=args: self._download(*args)))
+        
+        results = self.engine.run(jobs)
+        for source_id, result, error in results:
+            if keep_going is not None and not keep_going():
+                logger.warning(f"Sweep stopped with {len(sources_by_id)} sources left")
+                results.close()
+                return
+            source = sources_by_id.pop(source_id)
             try:
-                new_count = self.fetch_feed(feed)
-                results[feed.id] = {'success': True, 'new_items': new_count}
+                if error is not None:
+                    raise error
+                counts = self._store_items(source, result)
+            except BudgetExhausted as e:
+                # Quota ran out while the sweep was under way
+                self.db.rollback()
+                self._defer(source, datetime.utcfromtimestamp(e.reset_at))
+                yield source_id, {}, None
             except Exception as e:
-                results[feed.id] = {'success': False, 'error': str(e)}
+                self.db.rollback()
+                self._record_failure(source, e)
+                yield source_id, None, f"Error fetching source {source_id}: {str(e)}"
+            else:
+                yield source_id, counts, None
+    
+    def _budget_twitter(self, sources: List[FeedSource]) -> Tuple[List[FeedSource], List[Tuple[FeedSource, datetime]]]:
+        """
+        Pick the Twitter sources the request budget can afford this tick.
         
-        return results
-
+        Each endpoint may spend its even share of the quota left in its rate
+        limit window (see TwitterBudget.allowance). Sources are ranked by
+        subscribers times publish rate, so the most read and most active
+        stay freshest; the rest are deferred, not failed.
+        
+        Returns:
+            The sources to fetch, and the deferred ones with when to try them again
+        """
+        by_endpoint = defaultdict(list)
+        for source in sources:
+            if source.feed_type == FeedType.TWITTER:
+                endpoint = twitter_endpoint(source.config or {})
+                if endpoint is not None:
+                    by_endpoint[endpoint].append(source)
+        
+        tick = settings.SCHEDULER_TICK_SECONDS
+        allowances = {endpoint: twitter_budget.allowance(endpoint, tick) for endpoint in by_endpoint}
+        over_budget = [
+            endpoint for endpoint, candidates in by_endpoint.items()
+            if allowances[endpoint] is not None and allowances[endpoint] < len(candidates)
+        ]
+        if not over_budget:
+            return sources, []
+        
+        subscribers = dict(self.db.query(Feed.source_id, func.count(Feed.id)).filter(
+            Feed.source_id.in_([source.id for endpoint in over_budget for source in by_endpoint[endpoint]])
+        ).group_by(Feed.source_id).all())
+        default_interval = settings.POLL_DEFAULT_INTERVAL_MINUTES * 60
+        
+        deferred = {}
+        for endpoint in over_budget:
+            ranked = sorted(
+                by_endpoint[endpoint],
+                key=lambda source: subscribers.get(source.id, 0) / (source.poll_interval or default_interval),
+                reverse=True
+            )
+            retry_at = twitter_budget.retry_at(endpoint, tick)
+            for source in ranked[allowances[endpoint]:]:
+                deferred[source.id] = (source, retry_at)
+        return [source for source in sources if source.id not in deferred], list(deferred.values())
+    
+    def _resolve_twitter_users(self, sources: List[FeedSource]) -> None:
+        """Look up the user IDs of every Twitter user source in one batch, ahead of the fetches"""
+        usernames = [
+            source.config['username'] for source in sources
+            if source.feed_type == FeedType.TWITTER and 'username' in (source.config or {})
+        ]
+        if not usernames or not self.twitter_service:
+            return
+        try:
+            self.twitter_service.resolve_user_ids(usernames)
+        except Exception as e:
+            # Each fetch resolves its own user instead
+            logger.warning(f"Batched Twitter user lookup failed: {e}")
+    
+    def _download(
+        self,
+        feed_type: FeedType,
+        url: str,
+        config: dict,
+        etag: Optional[str] = None,
+        modified: Optional[str] = None,
+        since_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Fetch and parse a feed's items. Performs network I/O only, no database access.
+        
+        Returns:
+            Dictionary with keys: status, etag, modified, items (None if not modified),
+            and since_id for Twitter sources
+        """
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = self._download_document(feed_type, url, config, etag, modified, since_id)
+            outcome = 'not_modified' if result['items'] is None else 'ok'
+            return result
+        except BudgetExhausted:
+            outcome = 'deferred'
+            raise
+        finally:
+            FETCH_SECONDS.labels(feed_type.value, outcome).observe(time.perf_counter() - started)
+    
+    def _download_document(
+        self,
+        feed_type: FeedType,
+        url: str,
+        config: dict,
+        etag: Optional[str],
+        modified: Optional[str],
+        since_id: Optional[str]
+    ) -> Dict:
+        if feed_type == FeedType.RSS:
+            return fetch_rss_feed(url, etag=etag, modified=modified)
+        elif feed_type == FeedType.TWITTER:
+            if not self.twitter_service:
+                raise Exception("Twitter service not configured")
+            
+            # Twitter config can specify username or hashtag
+            if 'username' in config:
+                items, since_id = self.twitter_service.get_user_tweets(
+                    config['username'],
+                    max_results=config.get('max_results', 10),
+                    since_id=since_id
+                )
+            elif 'hashtag' in config:
+                items, since_id = self.twitter_service.search_hashtag(
+                    config['hashtag'],
+                    max_results=config.get('max_results', 10),
+                    since_id=since_id
+                )
+            else:
+                raise Exception("Twitter feed config must specify 'username' or 'hashtag'")
+            return {
+                'status': None, 'etag': None, 'modified': None, 'update_interval': None,
+                'items': items, 'since_id': since_id
+            }
+        else:
+            raise Exception(f"Unsupported feed type: {feed_type}")
+    
+    def _store_items(self, source: FeedSource, result: Dict) -> Dict[int, int]:
+        """
+        Insert entries not yet stored for the source, copy them to every
+        subscription and commit. Cost depends on the size of the document,
+        not on how many entries the source has accumulated.
+        
+        Returns:
+            Dictionary mapping feed_id to number of new items
+        """
+        now = datetime.utcnow()
+        source.etag = result['etag']
+        source.last_modified = result['modified']
+        source.last_status = result['status']
+        source.last_fetched_at = now
+        source.error_count = 0
+        source.last_error = None
+        # Released by the commit that stores this result
+        self._release_lease(source)
+        
+        items_data = result['items']
+        if items_data is None:
+            # 304 Not Modified: nothing to parse or diff
+            self._reschedule(source, now)
+            self.db.commit()
+            return {}
+        source.update_interval = result['update_interval']
+        if result.get('since_id'):
+            # The next fetch asks only for tweets after this one
+            source.since_id = result['since_id']
+        
+        # Insert the document's entries in one statement per batch; the
+        # (source_id, url) unique key skips ones already stored
+        unique = {}
+        for item_data in items_data:
+            unique.setdefault(item_data['url'], item_data)
+        
+        rows = [
+            {
+                'source_id': source.id,
+                'title': item_data['title'],
+                'excerpt': make_excerpt(item_data.get('content')),
+                'url': url,
+                'published_at': item_data.get('published_at'),
+                'fetched_at': now
+            }
+            for url, item_data in unique.items()
+        ]
+        
+        new_entries = []
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            stmt = insert_or_ignore(self.db.get_bind(), SourceEntry, ['source_id', 'url']).values(
+                rows[start:start + INSERT_BATCH_SIZE]
+            ).returning(SourceEntry.id, SourceEntry.url)
+            new_entries += self.db.execute(stmt).all()
+        new_entry_ids = [entry_id for entry_id, _ in new_entries]
+        ITEMS_INSERTED.observe(len(new_entry_ids))
+        
+        # Bodies are stored only for entries that turned out to be new, so
+        # entries skipped by the unique key leave no unreferenced blobs
+        hashes = store_contents(self.db, (unique[url].get('content') for _, url in new_entries))
+        linked = [
+            {'id': entry_id, 'content_hash': hashes[unique[url]['content']]}
+            for entry_id, url in new_entries if unique[url].get('content')
+        ]
+        if linked:
+            self.db.execute(update(SourceEntry), linked)
+        
+        # Only entries inserted just now need indexing
+        index_entries(self.db, [
+            (entry_id, unique[url]['title'], unique[url].get('content')) for entry_id, url in new_entries
+        ])
+        
+        # Fan out to subscribers
+        feed_ids = [feed_id for (feed_id,) in self.db.query(Feed.id).filter(Feed.source_id == source.id)]
+        if new_entry_ids and feed_ids:
+            add_entries_to_feeds(self.db, source.id, now, entry_ids=new_entry_ids)
+        
+        self._reschedule(source, now)
+        self.db.commit()
+        
+        return {feed_id: len(new_entry_ids) for feed_id in feed_ids}
+    
+    def _reschedule(self, source: FeedSource, now: datetime) -> None:
+        """Set the source's next_fetch_at from its publish rate, hints and failures"""
+        published = [
+            published_at for (published_at,) in self.db.query(SourceEntry.published_at).filter(
+                SourceEntry.source_id == source.id,
+                SourceEntry.published_at.isnot(None)
+            ).order_by(SourceEntry.published_at.desc()).limit(RATE_SAMPLE_SIZE)
+        ]
+        source.poll_interval = poll_interval(published, source.update_interval, source.error_count, now)
+        source.next_fetch_at = next_due(source.poll_interval, now)
+    
+    def _release_lease(self, source: FeedSource) -> None:
+        """Drop this fetcher's lease on a source; manual fetches leave a worker's lease alone"""
+        if self.worker_id is not None:
+            release_lease(self.db, source.id, self.worker_id)
+    
+    def _defer(self, source: FeedSource, retry_at: datetime) -> None:
+        """Put off a fetch the Twitter budget can't afford, without counting it as a failure"""
+        try:
+            source.next_fetch_at = retry_at
+            self._release_lease(source)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+    
+    def _record_failure(self, source: FeedSource, error: Exception) -> None:
+        """Count a failed fetch and back off the source's next attempt"""
+        try:
+            now = datetime.utcnow()
+            # Throttling says nothing about the feed's health, so it isn't counted
+            if not isinstance(error, RetryAfter):
+                source.error_count = (source.error_count or 0) + 1
+            source.last_error = str(error)
+            self._release_lease(source)
+            self._reschedule(source, now)
+            if isinstance(error, RetryAfter):
+                # Not before the host said it would take requests again
+                source.next_fetch_at = max(source.next_fetch_at, now + timedelta(seconds=error.seconds))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
@@ -0,0 +1,121 @@
+from sqlalchemy import DateTime, func, literal, select
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import urlsplit, urlunsplit
+from app.core.database import insert_or_ignore
+from app.models.feed import Feed, FeedItem, FeedSource, FeedType, SourceEntry
+from app.services.content_store import purge_contents
+from app.services.counters import count_new_items
+from app.services.search_index import unindex_source
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a feed URL, used to share one source between subscribers.
+    
+    Lowercases the scheme and host, drops default ports and fragments and
+    gives an empty path a trailing slash. Query strings are kept as-is since
+    they often select the feed.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{credentials}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def source_key(feed_type: FeedType, url: str, config: Optional[dict]) -> str:
+    """Return the FeedSource.url identifying what a subscription fetches"""
+    if feed_type == FeedType.TWITTER:
+        config = config or {}
+        if 'username' in config:
+            return f"twitter://user/{config['username'].lstrip('@').lower()}"
+        if 'hashtag' in config:
+            return f"twitter://hashtag/{config['hashtag'].lstrip('#').lower()}"
+    return normalize_url(url)
+
+
+def get_or_create_source(db: Session, feed_type: FeedType, url: str, config: Optional[dict]) -> FeedSource:
+    """Find the shared source for a subscription, creating it on first use"""
+    key = source_key(feed_type, url, config)
+    source = db.query(FeedSource).filter(FeedSource.url == key).first()
+    if source is None:
+        source = FeedSource(url=key, feed_type=feed_type, config=dict(config or {}))
+        db.add(source)
+        db.flush()
+    return source
+
+
+def add_entries_to_feeds(
+    db: Session,
+    source_id: int,
+    fetched_at: Optional[datetime] = None,
+    entry_ids: Optional[List[int]] = None,
+    feed_id: Optional[int] = None
+) -> int:
+    """
+    Copy a source's entries to its subscriptions with a single INSERT ... SELECT
+    and credit each feed's counters with the rows it returns.
+    
+    Limited to `entry_ids` and/or one `feed_id` when given; pairs that already
+    exist are skipped. Undated entries sort by `fetched_at`, or by when the
+    entry itself was fetched if that is not given.
+    
+    Returns:
+        Number of items added
+    """
+    seen_at = literal(fetched_at, DateTime) if fetched_at else SourceEntry.fetched_at
+    query = select(
+        Feed.id,
+        Feed.user_id,
+        SourceEntry.id,
+        func.coalesce(SourceEntry.published_at, seen_at),
+        seen_at
+    ).join(
+        SourceEntry, SourceEntry.source_id == Feed.source_id
+    ).where(
+        Feed.source_id == source_id
+    )
+    if entry_ids is not None:
+        query = query.where(SourceEntry.id.in_(entry_ids))
+    if feed_id is not None:
+        query = query.where(Feed.id == feed_id)
+    
+    stmt = insert_or_ignore(db.get_bind(), FeedItem, ['feed_id', 'entry_id']).from_select(
+        ['feed_id', 'user_id', 'entry_id', 'published_at', 'fetched_at'], query
+    ).returning(FeedItem.feed_id)
+    added = db.scalars(stmt).all()
+    count_new_items(db, added)
+    return len(added)
+
+
+def backfill_subscription(db: Session, feed: Feed) -> int:
+    """
+    Give a new subscription its own copy of every entry the source already has.
+    
+    Returns:
+        Number of items added
+    """
+    return add_entries_to_feeds(db, feed.source_id, feed_id=feed.id)
+
+
+def release_source(db: Session, source: FeedSource) -> None:
+    """Delete a source and its entries once its last subscription is gone"""
+    remaining = db.query(Feed.id).filter(Feed.source_id == source.id).first()
+    if remaining is None:
+        unindex_source(db, source.id)
+        hashes = [content_hash for (content_hash,) in db.query(SourceEntry.content_hash).filter(
+            SourceEntry.source_id == source.id,
+            SourceEntry.content_hash.isnot(None)
+        )]
+        db.delete(source)
+        db.flush()
+        purge_contents(db, hashes)
@@ -0,0 +1,66 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Hashable, Iterable, Iterator, Tuple, Any
+from urllib.parse import urlparse
+from app.core.config import settings
+
+
+def host_of(url: str) -> str:
+    """Return the host part of a URL, used as the per-host concurrency key"""
+    return (urlparse(url).hostname or "").lower()
+
+
+class FetchEngine:
+    """
+    Bounded worker pool for the network half of a feed sweep.
+
+    Jobs are grouped by host. At most `max_workers` jobs run at once overall
+    and at most `per_host` of them target the same host, so a slow or
+    rate-limited host only ties up its own slots. Results are yielded in the
+    calling thread as soon as they complete, which lets the caller do all of
+    its database work there while other fetches are still in flight.
+    """
+
+    def __init__(self, max_workers: int = None, per_host: int = None):
+        self.max_workers = max(1, max_workers or settings.FETCH_MAX_WORKERS)
+        self.per_host = max(1, per_host or settings.FETCH_PER_HOST_LIMIT)
+
+    def run(
+        self, jobs: Iterable[Tuple[Hashable, str, Callable[[], Any]]]
+    ) -> Iterator[Tuple[Hashable, Any, Exception]]:
+        """
+        Run `(key, host, fn)` jobs concurrently.
+
+        Yields:
+            `(key, result, error)` tuples in completion order; exactly one of
+            `result` / `error` is meaningful for each job.
+        """
+        pending: Dict[str, deque] = {}
+        for key, host, fn in jobs:
+            pending.setdefault(host, deque()).append((key, fn))
+
+        if not pending:
+            return
+
+        in_flight: Dict[str, int] = {host: 0 for host in pending}
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="feed-fetch") as executor:
+            def submit_ready():
+                for host, queue in pending.items():
+                    while queue and in_flight[host] < self.per_host and len(futures) < self.max_workers:
+                        key, fn = queue.popleft()
+                        in_flight[host] += 1
+                        futures[executor.submit(fn)] = (key, host)
+
+            submit_ready()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, host = futures.pop(future)
+                    in_flight[host] -= 1
+                    try:
+                        yield key, future.result(), None
+                    except Exception as e:
+                        yield key, None, e
+                submit_ready()
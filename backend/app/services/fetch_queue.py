@@ -0,0 +1,134 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.feed import FeedSource
+
+logger = logging.getLogger(__name__)
+
+
+def new_worker_id() -> str:
+    """Identify one claimer across hosts, processes and restarts"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def claim_due_sources(db: Session, worker_id: str, limit: Optional[int], lease_seconds: Optional[int] = None) -> List[int]:
+    """
+    Lease up to `limit` due sources to a worker, most overdue first, and commit.
+
+    feed_sources is the queue: next_fetch_at orders it and the lease columns
+    mark claims. A source whose lease has expired, because its worker died
+    or stalled, is claimable again. The claim is a single UPDATE, which
+    SQLite serializes; on PostgreSQL the candidate rows are locked with
+    SKIP LOCKED, so concurrent workers take disjoint batches without waiting
+    on each other.
+
+    Returns:
+        Ids of the sources now leased to `worker_id`
+    """
+    now = datetime.utcnow()
+    due = select(FeedSource.id).filter(
+        FeedSource.subscriptions.any(),
+        FeedSource.next_fetch_at <= now,
+        or_(FeedSource.lease_expires_at.is_(None), FeedSource.lease_expires_at < now)
+    ).order_by(FeedSource.next_fetch_at).limit(limit)
+    if db.get_bind().dialect.name == "postgresql":
+        due = due.with_for_update(skip_locked=True)
+
+    claimed = db.execute(
+        update(FeedSource).where(FeedSource.id.in_(due.scalar_subquery())).values(
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds or settings.FETCH_LEASE_SECONDS)
+        ).returning(FeedSource.id)
+    ).scalars().all()
+    db.commit()
+    return claimed
+
+
+def renew_leases(db: Session, worker_id: str, lease_seconds: Optional[int] = None) -> int:
+    """
+    Push back the expiry of every lease a worker still holds, and commit.
+
+    Returns:
+        Number of leases renewed
+    """
+    renewed = db.execute(
+        update(FeedSource).where(FeedSource.lease_owner == worker_id).values(
+            lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds or settings.FETCH_LEASE_SECONDS)
+        )
+    ).rowcount
+    db.commit()
+    return renewed
+
+
+def release_leases(db: Session, worker_id: str) -> int:
+    """
+    Give back leases a worker claimed but never finished, and commit.
+
+    Returns:
+        Number of leases released
+    """
+    released = db.execute(
+        update(FeedSource).where(FeedSource.lease_owner == worker_id).values(lease_owner=None, lease_expires_at=None)
+    ).rowcount
+    db.commit()
+    return released
+
+
+def release_lease(db: Session, source_id: int, worker_id: str) -> None:
+    """
+    Give back one source's lease if `worker_id` still holds it.
+
+    Conditional on the owner, so a fetch that never claimed the source
+    leaves another worker's lease in place. Committed by the caller.
+    """
+    db.execute(
+        update(FeedSource).where(FeedSource.id == source_id, FeedSource.lease_owner == worker_id).values(
+            lease_owner=None, lease_expires_at=None
+        )
+    )
+
+
+class LeaseHeartbeat:
+    """
+    Keep a worker's leases alive from a background thread while it fetches.
+
+    Renews every third of the lease period on its own session. On exit,
+    leases that are still held are released so other workers can take
+    them right away.
+    """
+
+    def __init__(self, worker_id: str, session_factory: Callable[[], Session], lease_seconds: Optional[int] = None):
+        self.worker_id = worker_id
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds or settings.FETCH_LEASE_SECONDS
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                with self.session_factory() as db:
+                    renew_leases(db, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Could not renew fetch leases for {self.worker_id}: {e}")
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        try:
+            with self.session_factory() as db:
+                release_leases(db, self.worker_id)
+        except Exception as e:
+            # They expire on their own
+            logger.warning(f"Could not release fetch leases for {self.worker_id}: {e}")
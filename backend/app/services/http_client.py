@@ -0,0 +1,257 @@
+import socket
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from ipaddress import ip_address
+from typing import Dict, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from app.core.config import settings
+from app.services.fetch_engine import host_of
+
+THROTTLE_STATUSES = (429, 503)
+DEFAULT_RETRY_AFTER_SECONDS = 60  # When a 429 doesn't say how long to back off
+POOLED_HOSTS = 100  # Hosts that keep idle keep-alive connections
+
+
+class RetryAfter(Exception):
+    """A host asked us to back off, or is still inside a back-off it asked for earlier"""
+
+    def __init__(self, host: str, seconds: float):
+        super().__init__(f"{host} is rate limiting requests, retry after {seconds:.0f}s")
+        self.host = host
+        self.seconds = seconds
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header, in delta-seconds or HTTP-date form"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - (now if now is not None else time.time()))
+
+
+class DNSCache:
+    """
+    Resolved addresses per host name, kept for `ttl` seconds.
+
+    Every address a lookup returns is kept, in resolver order, so a
+    connection can fall back to the next one when an address is down.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        try:
+            ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return list(entry[1])
+        # Resolve outside the lock; a slow lookup for one host must not stall the others
+        addresses = list(dict.fromkeys(
+            info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        ))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+        return list(addresses)
+
+    def demote(self, host: str, port: int, address: str) -> None:
+        """Move an address that refused a connection behind the others"""
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and address in entry[1]:
+                addresses = [other for other in entry[1] if other != address] + [address]
+                self._entries[(host, port)] = (entry[0], addresses)
+
+    def forget(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class TokenBucket:
+    """
+    Rate limit for one host: `burst` requests back to back, then `rate` per second.
+
+    Kept in the equivalent theoretical-arrival-time form, so a reservation
+    is O(1) and needs no refill bookkeeping.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1 / rate
+        self.burst_window = (max(1, burst) - 1) * self.interval
+        self.next_free = 0.0
+        self.paused_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until the next request may be sent"""
+        return max(0.0, self.next_free - self.burst_window - now, self.paused_until - now)
+
+    def reserve(self, now: float, max_wait: float) -> Optional[float]:
+        """
+        Take the next slot if it starts within `max_wait` seconds.
+
+        Returns:
+            Seconds to wait before sending, or None if the slot is too far off
+            and nothing was reserved
+        """
+        wait = self.wait_time(now)
+        if wait > max_wait:
+            return None
+        self.next_free = max(self.next_free, now + wait) + self.interval
+        return wait
+
+
+class HostLimiter:
+    """Per-host token buckets shared by every fetch thread"""
+
+    def __init__(self, rate: float, burst: int, max_wait: float):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def acquire(self, host: str) -> None:
+        """Block until `host` may receive another request; raise RetryAfter instead of waiting long"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(host)
+            wait = bucket.reserve(now, self.max_wait)
+            if wait is None:
+                raise RetryAfter(host, bucket.wait_time(now))
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, host: str, seconds: float) -> None:
+        """Hold all requests to `host` for `seconds`, as its Retry-After asked"""
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + seconds)
+
+
+dns_cache = DNSCache(settings.FETCH_DNS_CACHE_SECONDS)
+
+
+class _CachedDNSMixin:
+    def _new_conn(self):
+        # Connect to a cached address; TLS still verifies and sends SNI for self.host
+        hostname = self._dns_host
+        try:
+            addresses = dns_cache.resolve(hostname, self.port)
+            for attempt, address in enumerate(addresses, start=1):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError):
+                    if attempt == len(addresses):
+                        raise
+                    # Later connections start with an address that answers
+                    dns_cache.demote(hostname, self.port, address)
+        except Exception:
+            dns_cache.forget(hostname, self.port)
+            raise
+        finally:
+            self._dns_host = hostname
+
+
+class _CachedDNSHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDNSHTTPConnectionPool,
+            "https": _CachedDNSHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """
+    Shared HTTP client for the fetchers.
+
+    Connections are pooled and kept alive per host, host names are resolved
+    through a TTL cache, and every request first takes a slot from the
+    host's token bucket. A 429 or 503 pauses the host for its Retry-After
+    and raises RetryAfter, so the caller can reschedule instead of
+    retrying into the limit.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None, max_wait: float = None):
+        self.limiter = HostLimiter(
+            rate or settings.FETCH_HOST_RATE_PER_SECOND,
+            burst or settings.FETCH_HOST_BURST,
+            settings.FETCH_MAX_HOST_WAIT_SECONDS if max_wait is None else max_wait
+        )
+        self.session = requests.Session()
+        # Feeds don't need cookies, and a shared jar would leak them between sources
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = _PooledAdapter(
+            pool_connections=POOLED_HOSTS, pool_maxsize=settings.FETCH_PER_HOST_LIMIT, max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, headers: Dict[str, str], timeout: Tuple[float, float]) -> requests.Response:
+        """
+        Rate-limited streaming GET. The caller reads the body and closes the response.
+
+        Raises:
+            RetryAfter: the host is throttling us, now or from an earlier answer
+        """
+        host = host_of(url)
+        self.limiter.acquire(host)
+        response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        if response.status_code in THROTTLE_STATUSES:
+            seconds = parse_retry_after(response.headers.get("Retry-After"))
+            if seconds is None and response.status_code == 429:
+                seconds = DEFAULT_RETRY_AFTER_SECONDS
+            if seconds is not None:
+                response.close()
+                self.limiter.pause(host, seconds)
+                raise RetryAfter(host, seconds)
+        return response
+
+
+http_client = HttpClient()
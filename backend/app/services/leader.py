@@ -0,0 +1,116 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy import delete, or_, update
+from sqlalchemy.orm import Session
+from app.core.database import insert_or_ignore
+from app.models.leader import LeaderLease
+from app.services.fetch_queue import new_worker_id
+
+logger = logging.getLogger(__name__)
+
+
+class Leadership:
+    """
+    Leader election for one named role through a lease row.
+    
+    Every candidate calls `acquire()` periodically; it renews the lease for
+    the current leader and hands it to a caller only once it has expired, so
+    a leader that dies is replaced within `lease_seconds`.
+    """
+    
+    def __init__(self, name: str, lease_seconds: int, holder: Optional[str] = None):
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.is_leader = False
+        self._holder = holder
+        self._pid = os.getpid() if holder else None
+    
+    @property
+    def holder(self) -> str:
+        # Per process, so app workers forked after import don't share an identity
+        if self._pid != os.getpid():
+            self._holder, self._pid = new_worker_id(), os.getpid()
+            self.is_leader = False
+        return self._holder
+    
+    def acquire(self, db: Session) -> bool:
+        """
+        Become or stay leader if the lease is free, expired or already ours, and commit.
+        
+        Returns:
+            True if this process is the leader until the lease next needs renewing
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        # The first candidate ever creates the row; after that it's a conditional takeover
+        db.execute(insert_or_ignore(db.get_bind(), LeaderLease, ['name']).values(
+            name=self.name, holder=self.holder, expires_at=expires_at
+        ))
+        acquired = db.execute(
+            update(LeaderLease).where(
+                LeaderLease.name == self.name,
+                or_(LeaderLease.holder == self.holder, LeaderLease.expires_at < now)
+            ).values(holder=self.holder, expires_at=expires_at)
+        ).rowcount == 1
+        db.commit()
+        
+        if acquired != self.is_leader:
+            logger.info(f"{self.holder} {'became' if acquired else 'is no longer'} {self.name} leader")
+        self.is_leader = acquired
+        return acquired
+    
+    def release(self, db: Session) -> None:
+        """Step down so another candidate can take over at its next attempt"""
+        db.execute(delete(LeaderLease).where(LeaderLease.name == self.name, LeaderLease.holder == self.holder))
+        db.commit()
+        self.is_leader = False
+
+
+class LeaderHeartbeat:
+    """
+    Keep leadership alive from a background thread during work that may
+    outlast the lease, such as a long sweep.
+    
+    Renews every third of the lease period on its own session, like
+    fetch_queue.LeaseHeartbeat. Once a renewal is refused, or none has
+    succeeded for a whole lease period, `held()` turns False for good and
+    the work should stop: another candidate may already be leader.
+    """
+    
+    def __init__(self, leadership: Leadership, session_factory: Callable[[], Session]):
+        self.leadership = leadership
+        self.session_factory = session_factory
+        self._renewed_at = time.monotonic()
+        self._lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="leader-heartbeat", daemon=True)
+    
+    def held(self) -> bool:
+        if time.monotonic() - self._renewed_at >= self.leadership.lease_seconds:
+            self._lost.set()
+        return not self._lost.is_set()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.leadership.lease_seconds / 3) and self.held():
+            try:
+                with self.session_factory() as db:
+                    renewed = self.leadership.acquire(db)
+            except Exception as e:
+                logger.warning(f"Could not renew {self.leadership.name} leadership: {e}")
+                continue
+            if renewed:
+                self._renewed_at = time.monotonic()
+            else:
+                self._lost.set()
+    
+    def __enter__(self) -> "LeaderHeartbeat":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
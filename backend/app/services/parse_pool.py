@@ -0,0 +1,71 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ParsePool:
+    """
+    Optional process pool for CPU-bound parsing.
+
+    feedparser is pure Python, so fetch threads parsing in-process take turns
+    on the GIL. With `size` > 0, each fetch thread hands its document to a
+    worker process instead and blocks (without holding the GIL) until the
+    compact result comes back, so a sweep parses on every core. With size 0,
+    or if the pool can't be started or breaks, parsing runs in the calling
+    thread as before.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = settings.PARSE_POOL_SIZE if size is None else size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable, *args) -> Any:
+        """Call `fn(*args)` in a worker process; `fn` must be a picklable module-level function"""
+        executor = self._get_executor()
+        if executor is None:
+            return fn(*args)
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            logger.warning("Parse pool broke, restarting it and parsing in-process")
+            self._discard(executor)
+            return fn(*args)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.size <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                try:
+                    # spawn, not fork: the parent runs scheduler and fetch threads
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.size,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, NotImplementedError, ValueError) as e:
+                    logger.warning(f"Parse pool unavailable, parsing in-process: {e}")
+                    self.size = 0
+                    return None
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+parse_pool = ParsePool()
@@ -0,0 +1,84 @@
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.core.config import settings
+
+# sy:updatePeriod values from the RSS syndication module, in seconds
+UPDATE_PERIODS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 7 * 86400,
+    "monthly": 30 * 86400,
+    "yearly": 365 * 86400,
+}
+
+MAX_BACKOFF_EXPONENT = 6
+
+
+def publisher_interval(ttl: Optional[str], update_period: Optional[str], update_frequency: Optional[str]) -> Optional[int]:
+    """
+    Polling interval the publisher asks for, in seconds.
+    
+    Uses the RSS <ttl> (minutes) or the sy:updatePeriod / sy:updateFrequency
+    pair, whichever is longer. Returns None when the feed gives no hint.
+    """
+    hints = []
+    try:
+        if ttl:
+            hints.append(int(ttl) * 60)
+    except (TypeError, ValueError):
+        pass
+    period = UPDATE_PERIODS.get((update_period or "").strip().lower())
+    if period:
+        try:
+            frequency = max(1, int(update_frequency or 1))
+        except (TypeError, ValueError):
+            frequency = 1
+        hints.append(period // frequency)
+    return max(hints) if hints else None
+
+
+def observed_interval(published: List[datetime]) -> Optional[float]:
+    """Mean gap in seconds between the given publish times, or None with fewer than two"""
+    published = sorted(p for p in published if p is not None)
+    if len(published) < 2:
+        return None
+    span = (published[-1] - published[0]).total_seconds()
+    return span / (len(published) - 1)
+
+
+def poll_interval(
+    published: List[datetime],
+    hint: Optional[int],
+    error_count: int = 0,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Seconds until a source should be polled again.
+    
+    Polls at half the observed posting interval so a new post waits on
+    average a quarter of that gap, never more often than the publisher's
+    hint allows, and backs off exponentially after consecutive failures.
+    The time since the newest post counts as a gap too, so a feed that
+    went quiet after a burst is polled less and less often.
+    """
+    minimum = settings.POLL_MIN_INTERVAL_MINUTES * 60
+    maximum = settings.POLL_MAX_INTERVAL_MINUTES * 60
+
+    observed = observed_interval(published)
+    interval = observed / 2 if observed is not None else settings.POLL_DEFAULT_INTERVAL_MINUTES * 60
+    dated = [p for p in published if p is not None]
+    if dated:
+        quiet = ((now or datetime.utcnow()) - max(dated)).total_seconds()
+        interval = max(interval, quiet / 2)
+    if hint:
+        interval = max(interval, hint)
+    if error_count:
+        interval *= 2 ** min(error_count, MAX_BACKOFF_EXPONENT)
+    return int(min(max(interval, minimum), maximum))
+
+
+def next_due(interval: int, now: Optional[datetime] = None) -> datetime:
+    """Next fetch time, jittered by +/-10% so sources added together drift apart"""
+    now = now or datetime.utcnow()
+    return now + timedelta(seconds=interval * random.uniform(0.9, 1.1))
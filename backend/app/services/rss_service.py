@@ -1,51 +1,238 @@
 import feedparser
+import requests
+import socket
+import time
+import urllib3
+import zlib
 from datetime import datetime
-from typing import List, Dict, Optional
-from app.models.feed import FeedItem
+from typing import List, Dict, Optional, Tuple
+from urllib3.exceptions import ReadTimeoutError
+from app.core.config import settings
+from app.core.metrics import Histogram, BYTE_BUCKETS
+from app.services.http_client import RetryAfter, http_client
+from app.services.parse_pool import parse_pool
+from app.services.poll_schedule import publisher_interval
 
+HTTP_NOT_MODIFIED = 304
+ACCEPT = "application/atom+xml,application/rss+xml,application/rdf+xml;q=0.9,application/xml;q=0.8,text/xml;q=0.8,*/*;q=0.1"
+ACCEPT_ENCODING = "gzip, deflate"
+CHUNK_SIZE = 64 * 1024
+# HTTPResponse.read1 needs urllib3 2.3+. Older versions only have read(),
+# which waits for a full chunk, so the fallback reads smaller ones to
+# check the deadline more often
+HAS_READ1 = tuple(int(part) for part in urllib3.__version__.split('.')[:2]) >= (2, 3)
+FALLBACK_CHUNK_SIZE = 8 * 1024
 
-def parse_rss_feed(url: str) -> List[Dict]:
+# Field order of the compact item tuples returned by parse_feed_document
+ITEM_FIELDS = ('title', 'content', 'url', 'published_at')
+
+FETCH_BYTES = Histogram("feedly_fetch_bytes", "Size of downloaded feed documents after decompression", buckets=BYTE_BUCKETS)
+PARSE_SECONDS = Histogram("feedly_parse_seconds", "Time spent parsing a feed document, including the hop to the parse pool")
+
+
+class FetchAborted(Exception):
+    """A download was cut off because it broke a size or time limit"""
+
+
+def _decoder(encoding: Optional[str]):
+    """Return a streaming decompressor for a Content-Encoding, None for identity"""
+    encoding = (encoding or 'identity').strip().lower()
+    if encoding in ('identity', ''):
+        return None
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        # Auto-detects a zlib or gzip header
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    raise FetchAborted(f"unsupported content encoding '{encoding}'")
+
+
+def _read_body(response: requests.Response, headers: Dict[str, str], started: float) -> bytes:
     """
-    Parse an RSS feed and return a list of feed items.
+    Stream a response body, decompressing as it arrives.
+    
+    Both the bytes on the wire and the decompressed document are held to
+    FETCH_MAX_BYTES, and the whole download to FETCH_TOTAL_TIMEOUT_SECONDS.
     
     Returns:
-        List of dictionaries with keys: title, content, url, published_at
+        The decoded body
+    """
+    max_bytes = settings.FETCH_MAX_BYTES
+    deadline = started + settings.FETCH_TOTAL_TIMEOUT_SECONDS
+    
+    declared = headers.get('content-length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise FetchAborted(f"response is {declared} bytes, limit is {max_bytes}")
+    
+    decoder = _decoder(headers.get('content-encoding'))
+    received = 0
+    size = 0
+    chunks = []
+    while True:
+        try:
+            # read1 returns whatever one socket read gives, so a trickling
+            # server can't hold us inside a single call past the deadline.
+            # Decoding stays here, where the output size is bounded
+            if HAS_READ1:
+                chunk = response.raw.read1(CHUNK_SIZE, decode_content=False)
+            else:
+                chunk = response.raw.read(FALLBACK_CHUNK_SIZE, decode_content=False)
+        except (socket.timeout, ReadTimeoutError):
+            raise FetchAborted(f"no data for {settings.FETCH_READ_TIMEOUT_SECONDS:g}s")
+        if not chunk:
+            break
+        received += len(chunk)
+        if decoder:
+            # Asking for at most one byte past the limit is enough to detect a
+            # compression bomb without inflating it
+            chunk = decoder.decompress(chunk, max_bytes - size + 1)
+        size += len(chunk)
+        if received > max_bytes or size > max_bytes:
+            raise FetchAborted(f"response exceeds {max_bytes} bytes")
+        if time.monotonic() > deadline:
+            raise FetchAborted(f"download took longer than {settings.FETCH_TOTAL_TIMEOUT_SECONDS:g}s")
+        chunks.append(chunk)
+    
+    if decoder:
+        try:
+            chunks.append(decoder.flush())
+        except zlib.error as e:
+            raise FetchAborted(f"corrupt compressed body: {e}")
+        if size + len(chunks[-1]) > max_bytes:
+            raise FetchAborted(f"response exceeds {max_bytes} bytes")
+    return b''.join(chunks)
+
+
+def download_feed(url: str, etag: Optional[str] = None, modified: Optional[str] = None) -> Tuple[int, Dict[str, str], Optional[bytes]]:
     """
+    Conditional GET for a feed document. Network I/O only, nothing is parsed.
+    
+    Goes through the shared http_client, so connections are reused and the
+    host's rate limit applies. The body is streamed under the FETCH_* size
+    and time limits and decompressed on the way in; breaking a limit raises
+    FetchAborted, a throttling host raises RetryAfter.
+    
+    Returns:
+        `(status, headers, body)` with lower-cased header names; body is None
+        on 304. Headers describe the decoded body, without Content-Encoding
+    """
+    request_headers = {'User-Agent': feedparser.USER_AGENT, 'Accept': ACCEPT, 'Accept-Encoding': ACCEPT_ENCODING}
+    if etag:
+        request_headers['If-None-Match'] = etag
+    if modified:
+        request_headers['If-Modified-Since'] = modified
+    
+    started = time.monotonic()
+    timeout = (settings.FETCH_CONNECT_TIMEOUT_SECONDS, settings.FETCH_READ_TIMEOUT_SECONDS)
     try:
-        feed = feedparser.parse(url)
+        response = http_client.get(url, request_headers, timeout)
+    except requests.exceptions.ConnectTimeout:
+        raise FetchAborted(f"could not connect within {settings.FETCH_CONNECT_TIMEOUT_SECONDS:g}s")
+    except requests.exceptions.ReadTimeout:
+        raise FetchAborted(f"no response within {settings.FETCH_READ_TIMEOUT_SECONDS:g}s")
+    
+    with response:
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        if response.status_code == HTTP_NOT_MODIFIED:
+            return response.status_code, headers, None
+        response.raise_for_status()
+        data = _read_body(response, headers, started)
+    
+    headers.pop('content-encoding', None)
+    headers.pop('content-length', None)
+    return response.status_code, headers, data
+
+
+def parse_feed_document(data: bytes, url: str, headers: Dict[str, str]) -> Tuple[Optional[int], List[tuple]]:
+    """
+    Parse a feed document. Pure CPU work, safe to run in a worker process.
+    
+    Returns:
+        `(update_interval, items)` where items are tuples in ITEM_FIELDS order,
+        which pickle far smaller than feedparser's entry objects
+    """
+    feed = feedparser.parse(data, response_headers={**headers, 'content-location': url})
+    
+    if feed.bozo and feed.bozo_exception:
+        raise Exception(f"Error parsing RSS feed: {feed.bozo_exception}")
+    
+    channel = feed.get('feed', {})
+    update_interval = publisher_interval(
+        channel.get('ttl'), channel.get('sy_updateperiod'), channel.get('sy_updatefrequency')
+    )
+    
+    items = []
+    for entry in feed.entries:
+        # Parse published date
+        published_at = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            try:
+                published_at = datetime(*entry.published_parsed[:6])
+            except:
+                pass
         
-        if feed.bozo and feed.bozo_exception:
-            raise Exception(f"Error parsing RSS feed: {feed.bozo_exception}")
+        # Get content
+        content = None
+        if hasattr(entry, 'content'):
+            content = entry.content[0].value if entry.content else None
+        elif hasattr(entry, 'summary'):
+            content = entry.summary
+        
+        # Get link
+        link = entry.link if hasattr(entry, 'link') else None
+        
+        if entry.get('title') and link:
+            items.append((entry.title, content, link, published_at))
+    
+    return update_interval, items
+
+
+def fetch_rss_feed(url: str, etag: Optional[str] = None, modified: Optional[str] = None) -> Dict:
+    """
+    Fetch an RSS feed with a conditional GET and parse it if it changed.
+    
+    The download happens in the calling thread; parsing goes to the parse
+    pool when one is configured.
+    
+    Returns:
+        Dictionary with keys: status, etag, modified, update_interval, items.
+        `items` is None when the server answered 304 Not Modified; otherwise
+        it is a list of dictionaries with keys: title, content, url, published_at
+    """
+    try:
+        status, headers, data = download_feed(url, etag=etag, modified=modified)
         
-        items = []
-        for entry in feed.entries:
-            # Parse published date
-            published_at = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                try:
-                    published_at = datetime(*entry.published_parsed[:6])
-                except:
-                    pass
-            
-            # Get content
-            content = None
-            if hasattr(entry, 'content'):
-                content = entry.content[0].value if entry.content else None
-            elif hasattr(entry, 'summary'):
-                content = entry.summary
-            
-            # Get link
-            link = entry.link if hasattr(entry, 'link') else None
-            
-            if entry.title and link:
-                items.append({
-                    'title': entry.title,
-                    'content': content,
-                    'url': link,
-                    'published_at': published_at
-                })
+        result = {
+            'status': status,
+            'etag': headers.get('etag'),
+            'modified': headers.get('last-modified'),
+            'update_interval': None,
+            'items': None
+        }
+        if status == HTTP_NOT_MODIFIED:
+            # Servers may omit validators on a 304; keep the ones we sent
+            result['etag'] = result['etag'] or etag
+            result['modified'] = result['modified'] or modified
+            return result
         
-        return items
+        FETCH_BYTES.observe(len(data))
+        with PARSE_SECONDS.time():
+            update_interval, items = parse_pool.run(parse_feed_document, data, url, headers)
+        result['update_interval'] = update_interval
+        result['items'] = [dict(zip(ITEM_FIELDS, item)) for item in items]
+        return result
+    except RetryAfter:
+        # Keeps its type so the fetcher can reschedule the source for when the host allows
+        raise
     except Exception as e:
         raise Exception(f"Failed to fetch RSS feed from {url}: {str(e)}")
 
+
+def parse_rss_feed(url: str) -> List[Dict]:
+    """
+    Parse an RSS feed and return a list of feed items.
+    
+    Returns:
+        List of dictionaries with keys: title, content, url, published_at
+    """
+    return fetch_rss_feed(url)['items']
@@ -0,0 +1,126 @@
+"""
+Full-text index over SourceEntry titles and bodies.
+
+SQLite uses a contentless FTS5 table keyed by entry id; PostgreSQL uses a
+side table of tsvectors with a GIN index. Both are written incrementally by
+the ingest path and joined back to feed_items when searching.
+"""
+import re
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import Select, column, func, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models.feed import ContentBlob, SourceEntry
+from app.services.text import html_to_text
+
+SQLITE_TABLE = "source_entries_fts"
+POSTGRES_TABLE = "source_entry_search"
+POSTGRES_CONFIG = "english"
+
+TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def create_search_index(bind) -> None:
+    """Create the dialect's index structures if they don't exist yet"""
+    if bind.dialect.name == "sqlite":
+        bind.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} "
+            "USING fts5(title, content, content='', tokenize='porter unicode61')"
+        )
+    elif bind.dialect.name == "postgresql":
+        bind.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+            "entry_id INTEGER PRIMARY KEY REFERENCES source_entries (id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        bind.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{POSTGRES_TABLE}_document ON {POSTGRES_TABLE} USING GIN (document)"
+        )
+
+
+def drop_search_index(bind) -> None:
+    table_name = SQLITE_TABLE if bind.dialect.name == "sqlite" else POSTGRES_TABLE
+    bind.exec_driver_sql(f"DROP TABLE IF EXISTS {table_name}")
+
+
+def ensure_search_index(engine: Engine) -> None:
+    with engine.begin() as connection:
+        create_search_index(connection)
+
+
+def index_entries(db: Session, entries: Iterable[Tuple[int, str, Optional[str]]]) -> None:
+    """Add `(entry_id, title, content)` rows to the index in the session's transaction"""
+    rows = [
+        {"entry_id": entry_id, "title": title or "", "content": html_to_text(content)}
+        for entry_id, title, content in entries
+    ]
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        db.execute(
+            text(f"INSERT INTO {SQLITE_TABLE} (rowid, title, content) VALUES (:entry_id, :title, :content)"),
+            rows
+        )
+    elif dialect == "postgresql":
+        db.execute(
+            text(
+                f"INSERT INTO {POSTGRES_TABLE} (entry_id, document) VALUES (:entry_id, "
+                f"setweight(to_tsvector('{POSTGRES_CONFIG}', :title), 'A') || "
+                f"setweight(to_tsvector('{POSTGRES_CONFIG}', :content), 'B')) "
+                "ON CONFLICT (entry_id) DO NOTHING"
+            ),
+            rows
+        )
+
+
+def unindex_source(db: Session, source_id: int) -> None:
+    """
+    Remove a source's entries from the index before they are deleted.
+    
+    Contentless FTS5 tables can only drop a row given the text it was indexed
+    with; PostgreSQL rows go with the entries through ON DELETE CASCADE.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    entries = db.query(SourceEntry.id, SourceEntry.title, ContentBlob).outerjoin(SourceEntry.blob).filter(
+        SourceEntry.source_id == source_id
+    ).all()
+    rows = [
+        {"entry_id": entry_id, "title": title or "", "content": html_to_text(blob.text if blob else None)}
+        for entry_id, title, blob in entries
+    ]
+    if rows:
+        db.execute(
+            text(
+                f"INSERT INTO {SQLITE_TABLE} ({SQLITE_TABLE}, rowid, title, content) "
+                "VALUES ('delete', :entry_id, :title, :content)"
+            ),
+            rows
+        )
+
+
+def match_query(dialect: str, q: str) -> Optional[Select]:
+    """
+    Select `(entry_id, rank)` for entries matching every term in `q`, best first
+    when ordered by ascending rank. Returns None if `q` has no searchable terms.
+    """
+    terms = TERM.findall(q)
+    if not terms:
+        return None
+    if dialect == "sqlite":
+        # Quote each term so user input can't inject FTS5 query syntax
+        fts_query = " ".join('"%s"' % term for term in terms)
+        fts = table(SQLITE_TABLE, column("rowid"))
+        return select(
+            fts.c.rowid.label("entry_id"),
+            func.bm25(text(SQLITE_TABLE)).label("rank")
+        ).select_from(fts).where(text(f"{SQLITE_TABLE} MATCH :fts_query").bindparams(fts_query=fts_query))
+    if dialect == "postgresql":
+        search = table(POSTGRES_TABLE, column("entry_id"), column("document"))
+        tsquery = func.plainto_tsquery(POSTGRES_CONFIG, " ".join(terms))
+        return select(
+            search.c.entry_id,
+            (-func.ts_rank_cd(search.c.document, tsquery)).label("rank")
+        ).where(search.c.document.op("@@")(tsquery))
+    raise NotImplementedError(f"Full-text search is not supported for {dialect}")
@@ -0,0 +1,26 @@
+import html
+import re
+from typing import Optional
+
+EXCERPT_LENGTH = 280  # Characters of plain text shown in item lists
+
+TAG = re.compile(r"<[^>]+>")
+WHITESPACE = re.compile(r"\s+")
+
+
+def html_to_text(content: Optional[str]) -> str:
+    """Strip tags and entities from an HTML fragment, collapsing whitespace"""
+    if not content:
+        return ""
+    return WHITESPACE.sub(" ", html.unescape(TAG.sub(" ", content))).strip()
+
+
+def make_excerpt(content: Optional[str], length: int = EXCERPT_LENGTH) -> Optional[str]:
+    """Plain-text preview of an item body, cut at a word boundary"""
+    text = html_to_text(content)
+    if not text:
+        return None
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(" ,;:.") + "…"
@@ -0,0 +1,155 @@
+import math
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Tuple
+from app.core.metrics import CallbackGauge
+
+# Rate limits are per endpoint; timelines of different users share one
+USER_TWEETS = "/2/users/:id/tweets"
+SEARCH_RECENT = "/2/tweets/search/recent"
+USER_LOOKUP = "/2/users/by"
+DEFAULT_WINDOW_SECONDS = 15 * 60  # Twitter's rate limit window, assumed when a 429 carries no reset time
+
+
+def endpoint_of(path: str) -> str:
+    """Rate limit key for a request path, e.g. /2/users/42/tweets -> /2/users/:id/tweets"""
+    return re.sub(r"(?<=/users/)\d+", ":id", path)
+
+
+def reset_time(headers: Mapping[str, str]) -> Optional[float]:
+    """When the rate limit window resets according to x-rate-limit-reset, as a Unix timestamp"""
+    try:
+        return float(headers["x-rate-limit-reset"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class BudgetExhausted(Exception):
+    """No Twitter requests are left on an endpoint until its window resets"""
+
+    def __init__(self, endpoint: str, reset_at: float):
+        super().__init__(f"Twitter rate limit for {endpoint} is used up until {datetime.utcfromtimestamp(reset_at)} UTC")
+        self.endpoint = endpoint
+        self.reset_at = reset_at
+
+
+class _Window:
+    __slots__ = ("limit", "remaining", "reset_at")
+
+    def __init__(self, limit: int, remaining: int, reset_at: float):
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class TwitterBudget:
+    """
+    App-wide Twitter request quota per endpoint, learned from the
+    x-rate-limit-* headers of every response.
+
+    Between responses requests are counted down locally. An endpoint's
+    quota is unknown until it has answered once, and again once its window
+    has reset; requests are not held back while it is unknown. Other
+    processes spend from the same quota, which the next response's headers
+    account for.
+    """
+
+    def __init__(self):
+        self._windows: Dict[str, _Window] = {}
+        self._lock = threading.Lock()
+
+    def _window(self, endpoint: str, now: float) -> Optional[_Window]:
+        window = self._windows.get(endpoint)
+        if window is not None and window.reset_at <= now:
+            del self._windows[endpoint]
+            return None
+        return window
+
+    def observe(self, endpoint: str, headers: Mapping[str, str]) -> None:
+        """Record the quota a response reported"""
+        reset_at = reset_time(headers)
+        if reset_at is None:
+            return
+        try:
+            window = _Window(int(headers["x-rate-limit-limit"]), int(headers["x-rate-limit-remaining"]), reset_at)
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self._windows[endpoint] = window
+
+    def exhaust(self, endpoint: str, reset_at: Optional[float]) -> float:
+        """
+        Record a 429: nothing is left on `endpoint` until `reset_at`.
+
+        Returns:
+            When the window resets, as a Unix timestamp
+        """
+        reset_at = reset_at or time.time() + DEFAULT_WINDOW_SECONDS
+        with self._lock:
+            window = self._windows.get(endpoint)
+            self._windows[endpoint] = _Window(window.limit if window else 0, 0, reset_at)
+        return reset_at
+
+    def take(self, endpoint: str) -> None:
+        """
+        Spend one request on `endpoint`.
+
+        Raises:
+            BudgetExhausted: none are left in the current window
+        """
+        with self._lock:
+            window = self._window(endpoint, time.time())
+            if window is None:
+                return
+            if window.remaining <= 0:
+                raise BudgetExhausted(endpoint, window.reset_at)
+            window.remaining -= 1
+
+    def allowance(self, endpoint: str, horizon: float) -> Optional[int]:
+        """
+        Requests `endpoint` may take over the next `horizon` seconds, an even
+        share of what is left so the quota lasts until its window resets.
+
+        Returns:
+            Number of requests, or None if the quota isn't known
+        """
+        now = time.time()
+        with self._lock:
+            window = self._window(endpoint, now)
+            if window is None:
+                return None
+            remaining, seconds = window.remaining, window.reset_at - now
+        if seconds <= horizon:
+            return remaining
+        return math.ceil(remaining * horizon / seconds)
+
+    def retry_at(self, endpoint: str, horizon: float) -> datetime:
+        """When a fetch held back now should next be tried: after `horizon`, or at the reset if nothing is left"""
+        now = time.time()
+        with self._lock:
+            window = self._window(endpoint, now)
+            if window is not None and window.remaining <= 0:
+                return datetime.utcfromtimestamp(window.reset_at)
+        return datetime.utcfromtimestamp(now + horizon)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+    def remaining(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            now = time.time()
+            return {
+                (endpoint,): window.remaining for endpoint, window in list(self._windows.items())
+                if window.reset_at > now
+            }
+
+
+twitter_budget = TwitterBudget()
+
+TWITTER_REQUESTS_REMAINING = CallbackGauge(
+    "feedly_twitter_requests_remaining", "Twitter requests left in the current rate limit window",
+    ["endpoint"], twitter_budget.remaining
+)
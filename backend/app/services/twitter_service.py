@@ -1,7 +1,89 @@
+import logging
+import threading
+import time
 import tweepy
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
 from app.core.config import settings
+from app.services.twitter_budget import (
+    BudgetExhausted, SEARCH_RECENT, USER_LOOKUP, USER_TWEETS, endpoint_of, reset_time, twitter_budget
+)
+
+logger = logging.getLogger(__name__)
+
+TWITTER_API_URL = "https://api.twitter.com"  # Where tweepy sends every request
+USERS_PER_LOOKUP = 100  # Most usernames GET /2/users/by accepts at once
+PAGE_SIZE = 100  # Largest max_results of both timeline endpoints
+UNKNOWN_USER_SECONDS = 3600  # How long a username that matched no account is not looked up again
+
+
+class _BaseURLAdapter(HTTPAdapter):
+    """Redirect requests tweepy addresses to api.twitter.com to another base URL, e.g. a local stub"""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, request, **kwargs):
+        request.url = self.base_url + request.url[len(TWITTER_API_URL):]
+        return super().send(request, **kwargs)
+
+
+class UserIdCache:
+    """
+    Twitter username to user ID, each kept for `ttl` seconds.
+    
+    IDs never change, but a username can be given up and taken by another
+    account, so mappings are refreshed now and then instead of kept forever.
+    A username with no account is cached as "" for a shorter while.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(username.lower())
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+        return None
+
+    def put(self, username: str, user_id: str) -> None:
+        ttl = self.ttl if user_id else min(self.ttl, UNKNOWN_USER_SECONDS)
+        with self._lock:
+            self._entries[username.lower()] = (time.time() + ttl, user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_ids = UserIdCache(settings.TWITTER_USER_CACHE_SECONDS)
+
+
+def twitter_endpoint(config: dict) -> Optional[str]:
+    """The rate-limited endpoint a Twitter source's fetch reads"""
+    if 'username' in config:
+        return USER_TWEETS
+    if 'hashtag' in config:
+        return SEARCH_RECENT
+    return None
+
+
+def _observe_rate_limit(response, *args, **kwargs) -> None:
+    twitter_budget.observe(endpoint_of(urlsplit(response.url).path), response.headers)
+
+
+def _newest_id(tweets, since_id: Optional[str]) -> Optional[str]:
+    """Highest tweet ID among `tweets` and `since_id`; IDs are compared as numbers"""
+    ids = [int(tweet.id) for tweet in tweets]
+    if since_id is not None:
+        ids.append(int(since_id))
+    return str(max(ids)) if ids else None
 
 
 class TwitterService:
@@ -11,71 +93,177 @@ class TwitterService:
             raise ValueError("TWITTER_BEARER_TOKEN not configured")
         
         self.client = tweepy.Client(bearer_token=self.bearer_token)
+        if settings.TWITTER_API_URL.rstrip('/') != TWITTER_API_URL:
+            self.client.session.mount(TWITTER_API_URL, _BaseURLAdapter(settings.TWITTER_API_URL))
+        self.client.session.hooks['response'].append(_observe_rate_limit)
     
-    def get_user_tweets(self, username: str, max_results: int = 10) -> List[Dict]:
+    def _request(self, endpoint: str, call: Callable, **params):
         """
-        Fetch tweets from a Twitter user.
+        Make one API call against the endpoint's request budget.
+        
+        Raises:
+            BudgetExhausted: the endpoint's quota is used up, before or by this call
+        """
+        twitter_budget.take(endpoint)
+        try:
+            return call(**params)
+        except tweepy.TooManyRequests as e:
+            # TooManyRequests.reset_time only exists in newer tweepy releases
+            raise BudgetExhausted(endpoint, twitter_budget.exhaust(endpoint, reset_time(e.response.headers)))
+    
+    def resolve_user_ids(self, usernames: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up the user IDs behind usernames, skipping ones already cached
+        and batching the rest through the bulk lookup endpoint.
+        
+        Returns:
+            Dictionary mapping lowercased username to user ID, for accounts that exist
+        """
+        resolved = {}
+        missing = []
+        for username in sorted({username.lstrip('@').lower() for username in usernames}):
+            user_id = user_ids.get(username)
+            if user_id is None:
+                missing.append(username)
+            elif user_id:
+                resolved[username] = user_id
+        
+        for start in range(0, len(missing), USERS_PER_LOOKUP):
+            batch = missing[start:start + USERS_PER_LOOKUP]
+            # Unknown or suspended accounts come back as errors, not as a failed request
+            response = self._request(USER_LOOKUP, self.client.get_users, usernames=batch)
+            for user in response.data or []:
+                resolved[user.username.lower()] = str(user.id)
+            for username in batch:
+                user_ids.put(username, resolved.get(username, ""))
+        return resolved
+    
+    def _read_timeline(
+        self,
+        endpoint: str,
+        fetch: Callable,
+        token_param: str,
+        since_id: Optional[str],
+        max_results: int,
+        **params
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Read tweets newer than `since_id`, newest first.
+        
+        Without a since_id only the latest `max_results` are read. With one,
+        full pages are followed until the backlog is read, TWITTER_MAX_PAGES
+        is reached or the budget runs out; tweets older than that are skipped.
         
         Returns:
-            List of dictionaries with keys: title, content, url, published_at
+            The tweets, and the newest tweet ID seen (`since_id` if none are new)
+        """
+        if since_id is None:
+            tweets = self._request(endpoint, fetch, max_results=max_results, **params).data or []
+            return tweets, _newest_id(tweets, None)
+        
+        tweets = []
+        token = None
+        for page in range(settings.TWITTER_MAX_PAGES):
+            try:
+                response = self._request(
+                    endpoint, fetch, max_results=PAGE_SIZE, since_id=since_id, **{token_param: token}, **params
+                )
+            except BudgetExhausted:
+                if not page:
+                    raise
+                logger.info(f"Twitter budget for {endpoint} ran out mid-backlog; skipping older tweets")
+                break
+            tweets += response.data or []
+            token = response.meta.get('next_token')
+            if not token:
+                break
+        else:
+            logger.info(f"Twitter backlog longer than {settings.TWITTER_MAX_PAGES} pages; skipping older tweets")
+        return tweets, _newest_id(tweets, since_id)
+    
+    def get_user_tweets(
+        self,
+        username: str,
+        max_results: int = 10,
+        since_id: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch tweets from a Twitter user, only those newer than `since_id` if given.
+        
+        Returns:
+            List of dictionaries with keys: title, content, url, published_at,
+            and the newest tweet ID seen
         """
         try:
-            # Get user ID from username
-            user = self.client.get_user(username=username)
-            if not user.data:
+            user_id = self.resolve_user_ids([username]).get(username.lstrip('@').lower())
+            if user_id is None:
                 raise Exception(f"User {username} not found")
             
-            user_id = user.data.id
-            
-            # Get tweets
-            tweets = self.client.get_users_tweets(
+            tweets, newest_id = self._read_timeline(
+                USER_TWEETS, self.client.get_users_tweets, 'pagination_token', since_id, max_results,
                 id=user_id,
-                max_results=max_results,
                 tweet_fields=['created_at', 'text', 'public_metrics']
             )
             
             items = []
-            if tweets.data:
-                for tweet in tweets.data:
-                    items.append({
-                        'title': f"Tweet by @{username}",
-                        'content': tweet.text,
-                        'url': f"https://twitter.com/{username}/status/{tweet.id}",
-                        'published_at': tweet.created_at
-                    })
+            for tweet in tweets:
+                items.append({
+                    'title': f"Tweet by @{username}",
+                    'content': tweet.text,
+                    'url': f"https://twitter.com/{username}/status/{tweet.id}",
+                    'published_at': tweet.created_at
+                })
             
-            return items
+            return items, newest_id
+        except BudgetExhausted:
+            raise
         except Exception as e:
             raise Exception(f"Failed to fetch tweets from @{username}: {str(e)}")
     
-    def search_hashtag(self, hashtag: str, max_results: int = 10) -> List[Dict]:
+    def search_hashtag(
+        self,
+        hashtag: str,
+        max_results: int = 10,
+        since_id: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
         """
-        Search for tweets with a specific hashtag.
+        Search for tweets with a specific hashtag, only those newer than `since_id` if given.
         
         Returns:
-            List of dictionaries with keys: title, content, url, published_at
+            List of dictionaries with keys: title, content, url, published_at,
+            and the newest tweet ID seen
         """
         try:
             # Remove # if present
             query = hashtag.lstrip('#')
             
-            tweets = self.client.search_recent_tweets(
-                query=f"#{query}",
-                max_results=max_results,
-                tweet_fields=['created_at', 'text', 'author_id']
-            )
+            def read(since_id):
+                return self._read_timeline(
+                    SEARCH_RECENT, self.client.search_recent_tweets, 'next_token', since_id, max_results,
+                    query=f"#{query}",
+                    tweet_fields=['created_at', 'text', 'author_id']
+                )
+            
+            try:
+                tweets, newest_id = read(since_id)
+            except tweepy.BadRequest:
+                # Recent search rejects a since_id older than its seven-day window
+                if since_id is None:
+                    raise
+                tweets, newest_id = read(None)
             
             items = []
-            if tweets.data:
-                for tweet in tweets.data:
-                    items.append({
-                        'title': f"Tweet #{hashtag}",
-                        'content': tweet.text,
-                        'url': f"https://twitter.com/i/web/status/{tweet.id}",
-                        'published_at': tweet.created_at
-                    })
+            for tweet in tweets:
+                items.append({
+                    'title': f"Tweet #{hashtag}",
+                    'content': tweet.text,
+                    'url': f"https://twitter.com/i/web/status/{tweet.id}",
+                    'published_at': tweet.created_at
+                })
             
-            return items
+            return items, newest_id
+        except BudgetExhausted:
+            raise
         except Exception as e:
             raise Exception(f"Failed to search hashtag {hashtag}: {str(e)}")
 
@@ -86,4 +274,3 @@ def get_twitter_service() -> Optional[TwitterService]:
         return TwitterService()
     except ValueError:
         return None
-
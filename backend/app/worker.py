@@ -0,0 +1,87 @@
+"""
+Standalone fetch worker.
+
+Claims due sources from the feed_sources queue under a lease, fetches
+them and stores new entries, independently of the API processes. Run as
+many as needed, on any machine that can reach the database:
+
+    python -m app.worker
+    python -m app.worker --batch-size 100 --once
+
+Set SCHEDULER_ENABLED=false on the API processes to leave all fetching to
+workers; leaving it on is also safe, the leases keep sweeps from
+overlapping.
+"""
+import argparse
+import logging
+import signal
+import sys
+import threading
+import time
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import category, feed, user  # noqa: F401 - registers every mapper
+from app.services.feed_fetcher import FeedFetcher
+from app.services.fetch_queue import new_worker_id
+
+logger = logging.getLogger("app.worker")
+
+
+def run_batch(worker_id: str, batch_size: int) -> dict:
+    """
+    Claim and fetch one batch of due sources.
+
+    Returns:
+        Dictionary mapping source_id to fetch result; empty when nothing was due
+    """
+    with SessionLocal() as db:
+        return FeedFetcher(db).fetch_due_feeds(limit=batch_size, worker_id=worker_id)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.SCHEDULER_BATCH_SIZE, help="Sources claimed at a time")
+    parser.add_argument(
+        "--idle-seconds", type=float, default=settings.SCHEDULER_TICK_SECONDS,
+        help="Wait before polling again when nothing is due"
+    )
+    parser.add_argument("--once", action="store_true", help="Fetch one batch and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker_id = new_worker_id()
+    stopping = threading.Event()
+
+    def stop(signum, frame):
+        logger.info("Stopping after the current batch")
+        stopping.set()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    logger.info(f"Fetch worker {worker_id} started")
+    while not stopping.is_set():
+        started = time.monotonic()
+        try:
+            results = run_batch(worker_id, args.batch_size)
+        except Exception as e:
+            logger.error(f"Error in fetch batch: {str(e)}")
+            results = {}
+        if results:
+            failed = sum(1 for result in results.values() if not result['success'])
+            new_items = sum(result.get('new_items', 0) for result in results.values())
+            logger.info(
+                f"Fetched {len(results)} sources in {time.monotonic() - started:.1f}s, "
+                f"failed: {failed}, new items: {new_items}"
+            )
+        if args.once:
+            break
+        # A full batch means more may be due right away
+        if len(results) < args.batch_size:
+            stopping.wait(args.idle_seconds)
+    logger.info(f"Fetch worker {worker_id} stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Local HTTP server that generates RSS and Atom documents for benchmarks.
+
+Every feed is served at /feeds/<n>.xml and holds the newest `items`
+entries. Documents only change when `advance()` is called, which
+publishes `churn` new entries to every feed, so a run is reproducible and
+a fetch between two advances is answered 304 Not Modified:
+
+    python -m benchmarks.feed_server --port 8100 --items 50 --latency-ms 20
+"""
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from xml.sax.saxutils import escape
+
+FORMATS = ("rss", "atom", "mixed")
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+WORDS = (
+    "latency throughput index cache query feed parser socket worker queue batch "
+    "cursor replica shard schema vacuum commit buffer thread lease budget"
+).split()
+
+
+def _body(feed: int, entry: int, size: int) -> str:
+    """Deterministic HTML body of roughly `size` characters"""
+    words = []
+    length = 0
+    i = feed * 7919 + entry * 104729
+    while length < size:
+        word = WORDS[i % len(WORDS)]
+        words.append(word)
+        length += len(word) + 1
+        i = (i * 31 + 17) % 1000003
+    return f"<p>{' '.join(words)}</p>"
+
+
+class FeedServer:
+    """
+    Synthetic feed server running on a background thread.
+
+    Args:
+        items: Entries per document
+        churn: New entries published to each feed per `advance()`
+        latency: Seconds to wait before answering each request
+        format: "rss", "atom", or "mixed" (odd feeds Atom, even feeds RSS)
+        content_bytes: Approximate size of each entry body
+    """
+
+    def __init__(
+        self,
+        items: int = 50,
+        churn: int = 5,
+        latency: float = 0.0,
+        format: str = "rss",
+        content_bytes: int = 1000,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}")
+        self.items = items
+        self.churn = churn
+        self.latency = latency
+        self.format = format
+        self.content_bytes = content_bytes
+        self.version = 0
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, feed: int) -> str:
+        return f"{self.base_url}/feeds/{feed}.xml"
+
+    def advance(self, rounds: int = 1) -> None:
+        """Publish `churn` new entries to every feed"""
+        with self._lock:
+            self.version += rounds
+
+    def start(self) -> "FeedServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="feed-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FeedServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def document(self, feed: int, version: int) -> bytes:
+        newest = version * self.churn + self.items
+        entries = range(newest - 1, max(newest - self.items, 0) - 1, -1)
+        return (self._atom if self.is_atom(feed) else self._rss)(feed, entries).encode()
+
+    def is_atom(self, feed: int) -> bool:
+        return self.format == "atom" or (self.format == "mixed" and feed % 2 == 1)
+
+    def _published(self, entry: int) -> datetime:
+        return EPOCH + timedelta(minutes=10 * entry)
+
+    def _rss(self, feed: int, entries) -> str:
+        items = "".join(
+            f"<item><title>Feed {feed} entry {entry}</title>"
+            f"<link>{self.url(feed)}/{entry}</link>"
+            f"<guid>{self.url(feed)}/{entry}</guid>"
+            f"<pubDate>{format_datetime(self._published(entry))}</pubDate>"
+            f"<description>{escape(_body(feed, entry, self.content_bytes))}</description></item>"
+            for entry in entries
+        )
+        return (
+            '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+            f"<title>Feed {feed}</title><link>{self.url(feed)}</link><description>Synthetic</description>"
+            f"{items}</channel></rss>"
+        )
+
+    def _atom(self, feed: int, entries) -> str:
+        items = "".join(
+            f"<entry><title>Feed {feed} entry {entry}</title>"
+            f'<link href="{self.url(feed)}/{entry}"/>'
+            f"<id>{self.url(feed)}/{entry}</id>"
+            f"<updated>{self._published(entry).isoformat()}</updated>"
+            f'<content type="html">{escape(_body(feed, entry, self.content_bytes))}</content></entry>'
+            for entry in entries
+        )
+        return (
+            '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            f"<title>Feed {feed}</title><id>{self.url(feed)}</id>"
+            f"<updated>{EPOCH.isoformat()}</updated>{items}</feed>"
+        )
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.requests += 1
+                    version = server.version
+
+                path = self.path.split("?", 1)[0]
+                if not (path.startswith("/feeds/") and path.endswith(".xml")) or not path[7:-4].isdigit():
+                    self.send_error(404)
+                    return
+                feed = int(path[7:-4])
+
+                etag = f'"{feed}-{version}"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body = server.document(feed, version)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml" if server.is_atom(feed) else "application/rss+xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--items", type=int, default=50, help="Entries per document")
+    parser.add_argument("--churn", type=int, default=5, help="New entries per feed each --advance-seconds")
+    parser.add_argument("--advance-seconds", type=float, default=60, help="How often feeds publish, 0 never")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--format", choices=FORMATS, default="rss")
+    parser.add_argument("--content-bytes", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    server = FeedServer(
+        items=args.items, churn=args.churn, latency=args.latency_ms / 1000, format=args.format,
+        content_bytes=args.content_bytes, host=args.host, port=args.port
+    )
+    with server:
+        print(f"Serving {server.url(0)} ... (Ctrl+C to stop)")
+        try:
+            while True:
+                if args.advance_seconds > 0:
+                    time.sleep(args.advance_seconds)
+                    server.advance()
+                else:
+                    time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
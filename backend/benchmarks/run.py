@@ -0,0 +1,298 @@
+"""
+Measure ingest throughput and read API latency against a synthetic workload.
+
+Starts the local feed server, seeds a scratch database with users,
+nested categories and subscriptions, then measures:
+
+- fetch_all_feeds on a cold database, after every feed publishes new
+  entries, and when nothing changed (every source answers 304)
+- p50/p99 latency of the item list, category item, search, counts and
+  auth endpoints, called in-process through the ASGI app
+
+Everything runs offline. Results are written as JSON; pass an earlier
+results file to --compare to print the change for every metric:
+
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --compare baseline.json
+
+The target database is created and seeded from scratch; never point this
+at production data.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from benchmarks.feed_server import FORMATS, FeedServer
+
+PASSWORD = "benchmark-password"
+CATEGORIES_PER_USER = 3  # Children of one top-level category per user
+LOGIN_REQUESTS = 20  # Password hashing is deliberately slow; fewer samples are enough
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def latency_summary(samples: List[float]) -> dict:
+    return {
+        "requests": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def seed(db, server: FeedServer, args, rng: random.Random) -> List[dict]:
+    """
+    Create users, a category tree per user and their subscriptions.
+
+    Returns:
+        One dictionary per user with keys: email, token, parent_id, child_ids
+    """
+    from app.core.security import create_access_token, get_password_hash
+    from app.models.category import Category
+    from app.models.feed import Feed, FeedType
+    from app.models.user import User
+    from app.services.feed_sources import get_or_create_source
+
+    password_hash = get_password_hash(PASSWORD)
+    users = []
+    for i in range(args.users):
+        user = User(email=f"bench{i}@example.com", hashed_password=password_hash)
+        db.add(user)
+        db.flush()
+        parent = Category(name="All", user_id=user.id)
+        db.add(parent)
+        db.flush()
+        children = [Category(name=f"Topic {j}", user_id=user.id, parent_id=parent.id) for j in range(CATEGORIES_PER_USER)]
+        db.add_all(children)
+        db.flush()
+
+        for number in rng.sample(range(args.feeds), min(args.subscriptions, args.feeds)):
+            url = server.url(number)
+            source = get_or_create_source(db, FeedType.RSS, url, {})
+            db.add(Feed(
+                user_id=user.id, category_id=rng.choice(children).id, source_id=source.id,
+                name=f"Feed {number}", url=url, feed_type=FeedType.RSS, config={}
+            ))
+        users.append({
+            "email": user.email,
+            "token": create_access_token({"sub": user.email}),
+            "parent_id": parent.id,
+            "child_ids": [child.id for child in children],
+        })
+    db.commit()
+    return users
+
+
+def measure_fetch(session_factory) -> dict:
+    """Run one fetch_all_feeds sweep and report its throughput"""
+    from sqlalchemy import func
+    from app.models.feed import FeedItem, SourceEntry
+    from app.services.feed_fetcher import FeedFetcher
+
+    with session_factory() as db:
+        def row_counts():
+            return db.query(func.count(SourceEntry.id)).scalar(), db.query(func.count(FeedItem.id)).scalar()
+
+        entries_before, items_before = row_counts()
+        started = time.perf_counter()
+        results = FeedFetcher(db).fetch_all_feeds()
+        seconds = time.perf_counter() - started
+        entries_after, items_after = row_counts()
+
+    rows = (entries_after - entries_before) + (items_after - items_before)
+    return {
+        "sources": len(results),
+        "failed": sum(1 for result in results.values() if not result["success"]),
+        "seconds": round(seconds, 3),
+        "sources_per_sec": round(len(results) / seconds, 1),
+        "entries_inserted": entries_after - entries_before,
+        "items_inserted": items_after - items_before,
+        "rows_per_sec": round(rows / seconds, 1),
+    }
+
+
+def measure_requests(count: int, call: Callable[[int], object]) -> dict:
+    """Time `count` calls after one warm-up call; each must answer 200"""
+    call(0)
+    samples = []
+    for i in range(count):
+        started = time.perf_counter()
+        response = call(i)
+        samples.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"Benchmark request failed with {response.status_code}: {response.text[:200]}")
+    return latency_summary(samples)
+
+
+def measure_api(users: List[dict], requests: int) -> Dict[str, dict]:
+    from fastapi.testclient import TestClient
+    from app.core.user_cache import user_cache
+    from app.main import app
+
+    client = TestClient(app)
+
+    def headers(i: int) -> dict:
+        return {"Authorization": f"Bearer {users[i % len(users)]['token']}"}
+
+    def user(i: int) -> dict:
+        return users[i % len(users)]
+
+    second_pages = [
+        client.get("/api/items", headers=headers(i)).json()["next_cursor"] for i in range(len(users))
+    ]
+
+    def uncached_counts(i: int):
+        # Every token validation has to load the user
+        user_cache.clear()
+        return client.get("/api/counts", headers=headers(i))
+
+    calls = {
+        "GET /api/items": lambda i: client.get("/api/items", headers=headers(i)),
+        "GET /api/items?cursor": lambda i: client.get(
+            "/api/items", params={"cursor": second_pages[i % len(users)]}, headers=headers(i)
+        ),
+        "GET /api/items?unread_only": lambda i: client.get("/api/items?unread_only=true", headers=headers(i)),
+        "GET /api/categories/{id}/items": lambda i: client.get(
+            f"/api/categories/{user(i)['child_ids'][0]}/items", headers=headers(i)
+        ),
+        "GET /api/categories/{id}/items?include_subcategories": lambda i: client.get(
+            f"/api/categories/{user(i)['parent_id']}/items?include_subcategories=true", headers=headers(i)
+        ),
+        "GET /api/items/search": lambda i: client.get("/api/items/search?q=latency", headers=headers(i)),
+        "GET /api/counts": lambda i: client.get("/api/counts", headers=headers(i)),
+        "auth: GET /api/counts with a cold user cache": uncached_counts,
+    }
+    results = {name: measure_requests(requests, call) for name, call in calls.items()}
+    results["auth: POST /api/auth/login"] = measure_requests(min(requests, LOGIN_REQUESTS), lambda i: client.post(
+        "/api/auth/login", data={"username": user(i)["email"], "password": PASSWORD}
+    ))
+    return results
+
+
+def run(args) -> dict:
+    # Settings are read at import time, so the app is imported only once
+    # DATABASE_URL points at the scratch database
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import category, feed, user  # noqa: F401 - registers every table on Base
+    from app.services.search_index import create_search_index, drop_search_index
+
+    with engine.begin() as connection:
+        drop_search_index(connection)
+        Base.metadata.drop_all(bind=connection)
+        Base.metadata.create_all(bind=connection)
+        create_search_index(connection)
+
+    server = FeedServer(
+        items=args.items, churn=args.churn, latency=args.latency_ms / 1000,
+        format=args.format, content_bytes=args.content_bytes
+    )
+    with server:
+        with SessionLocal() as db:
+            users = seed(db, server, args, random.Random(args.seed))
+        ingest = {"cold": measure_fetch(SessionLocal)}
+        server.advance()
+        ingest["churn"] = measure_fetch(SessionLocal)
+        ingest["unchanged"] = measure_fetch(SessionLocal)
+        ingest["server_requests"] = server.requests
+        ingest["server_not_modified"] = server.not_modified
+
+    api = measure_api(users, args.requests)
+    engine.dispose()
+    return {"fetch_all_feeds": ingest, "api": api}
+
+
+def flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> None:
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    print(f"\nCompared with {baseline['meta'].get('revision')} ({baseline['meta'].get('started_at')}):")
+    for key in sorted(old.keys() & new.keys()):
+        change = f"{(new[key] - old[key]) / old[key] * 100:+.1f}%" if old[key] else "n/a"
+        print(f"  {key}: {old[key]} -> {new[key]} ({change})")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--feeds", type=int, default=200, help="Distinct sources on the feed server")
+    parser.add_argument("--subscriptions", type=int, default=25, help="Feeds each user subscribes to")
+    parser.add_argument("--items", type=int, default=50, help="Entries per feed document")
+    parser.add_argument("--churn", type=int, default=5, help="New entries per feed between the first two fetches")
+    parser.add_argument("--content-bytes", type=int, default=1000, help="Approximate size of each entry body")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Feed server delay per request")
+    parser.add_argument("--format", choices=FORMATS, default="mixed")
+    parser.add_argument(
+        "--host-rate", type=float, default=1000,
+        help="Per-host request rate for the fetchers; every synthetic feed shares one host"
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Timed calls per API endpoint")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the subscription layout")
+    parser.add_argument("--database-url", help="Scratch database (default: a temporary SQLite file)")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = args.database_url or f"sqlite:///{os.path.join(scratch, 'benchmark.db')}"
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["FETCH_HOST_RATE_PER_SECOND"] = str(args.host_rate)
+        os.environ["FETCH_HOST_BURST"] = str(max(1, int(args.host_rate)))
+        started_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        results = run(args)
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "compare", "database_url")}
+    report = {
+        "meta": {
+            "started_at": started_at,
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": database_url.split(":", 1)[0],
+        },
+        "params": params,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.core.database import Base
+from app.models import category, feed, leader, user  # noqa: F401 - registers every table on Base
+from app.services.search_index import ensure_search_index
+from app.services.twitter_budget import twitter_budget
+from app.services.twitter_service import user_ids
+from tests.twitter_stub import TwitterStub
+
+
+@pytest.fixture
+def db():
+    """Session on a fresh in-memory database at the latest schema"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def twitter_stub(monkeypatch):
+    """A running TwitterStub that TwitterService is configured to call"""
+    with TwitterStub() as stub:
+        monkeypatch.setattr(settings, "TWITTER_BEARER_TOKEN", "test-token")
+        monkeypatch.setattr(settings, "TWITTER_API_URL", stub.base_url)
+        user_ids.clear()
+        twitter_budget.clear()
+        yield stub
+    user_ids.clear()
+    twitter_budget.clear()
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from app.api.counts import get_counts
+from app.core.database import Base
+from app.models.category import Category, CategoryAssignment
+from app.models.feed import Feed, FeedItem, FeedType, SourceEntry
+from app.models.user import User
+from app.services.category_tree import category_subtree, items_in_categories
+from app.services.counters import set_read_state
+from app.services.feed_sources import add_entries_to_feeds, get_or_create_source
+
+
+def test_category_counts_match_items_in_categories(tmp_path):
+    url = f"sqlite:///{tmp_path / 'counts.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        user = User(email="reader@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        parent = Category(user_id=user.id, name="News")
+        db.add(parent)
+        db.flush()
+        child = Category(user_id=user.id, name="Tech", parent_id=parent.id)
+        db.add(child)
+
+        items = {}
+        for feed_number, (category, posts) in enumerate([(parent, [1, 2]), (None, [3, 4])]):
+            source = get_or_create_source(db, FeedType.RSS, f"https://example.com/{feed_number}.xml", {})
+            db.add(Feed(user_id=user.id, source_id=source.id, name="Feed", url=source.url,
+                        feed_type=FeedType.RSS, category_id=category.id if category else None))
+            db.add_all([
+                SourceEntry(source_id=source.id, title=f"Post {post}", url=f"https://example.com/{post}",
+                            published_at=datetime(2026, 1, post))
+                for post in posts
+            ])
+            db.flush()
+            add_entries_to_feeds(db, source.id)
+        for item in db.query(FeedItem).join(SourceEntry):
+            items[int(item.entry.url.rsplit("/", 1)[1])] = item
+        set_read_state(db, items[1], datetime(2026, 2, 1))
+
+        # 1 is filed under News by its feed and assigned to Tech; 3 and 4
+        # are only assigned, 4 to both
+        db.add_all([
+            CategoryAssignment(category_id=child.id, feed_item_id=items[1].id),
+            CategoryAssignment(category_id=child.id, feed_item_id=items[3].id),
+            CategoryAssignment(category_id=child.id, feed_item_id=items[4].id),
+            CategoryAssignment(category_id=parent.id, feed_item_id=items[4].id),
+        ])
+        db.commit()
+
+        expected = {}
+        for category in (parent, child):
+            matching = select(func.count(FeedItem.id)).where(items_in_categories(category_subtree(category.id)))
+            expected[category.id] = (
+                db.scalar(matching),
+                db.scalar(matching.where(FeedItem.read_at.is_(None)))
+            )
+
+        async def counts():
+            async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+            async with AsyncSession(async_engine) as session:
+                response = await get_counts(current_user=user, db=session)
+            await async_engine.dispose()
+            return response
+
+        response = asyncio.run(counts())
+
+    assert expected == {parent.id: (4, 3), child.id: (3, 2)}
+    assert {
+        category.id: (category.item_count, category.unread_count) for category in response.categories
+    } == expected
+    assert (response.item_count, response.unread_count) == (4, 3)
+    engine.dispose()
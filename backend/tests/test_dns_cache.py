@@ -0,0 +1,83 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from app.services import http_client
+from app.services.http_client import DNSCache, HttpClient
+
+HOST = "feeds.test"
+DOWN = "127.0.0.2"  # Loopback too, but nothing listens there
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    """Answer lookups for HOST with the listed addresses, counting lookups"""
+    answers = {"addresses": [], "lookups": 0}
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host != HOST:
+            # urllib3 looks up the numeric address it is handed, too
+            return real_getaddrinfo(host, port, *args, **kwargs)
+        answers["lookups"] += 1
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port)) for address in answers["addresses"]]
+
+    monkeypatch.setattr(http_client.socket, "getaddrinfo", getaddrinfo)
+    monkeypatch.setattr(http_client, "dns_cache", DNSCache(ttl=300))
+    return answers
+
+
+def get(port):
+    response = HttpClient(rate=100, burst=10, max_wait=0).get(f"http://{HOST}:{port}/", headers={}, timeout=(2, 2))
+    with response:
+        return response.content
+
+
+def test_cache_keeps_every_address():
+    cache = DNSCache(ttl=300)
+    assert cache.resolve("127.0.0.1", 80) == ["127.0.0.1"]
+
+
+def test_connection_falls_back_to_next_address(server, resolver):
+    resolver["addresses"] = [DOWN, "127.0.0.1", "127.0.0.1"]
+
+    assert get(server) == b"ok"
+    # Duplicates are dropped and the address that refused goes last
+    assert http_client.dns_cache.resolve(HOST, server) == ["127.0.0.1", DOWN]
+    assert get(server) == b"ok"
+    assert resolver["lookups"] == 1
+
+
+def test_entry_is_evicted_when_no_address_answers(server, resolver):
+    resolver["addresses"] = [DOWN]
+
+    with pytest.raises(requests.ConnectionError):
+        get(server)
+
+    resolver["addresses"] = ["127.0.0.1"]
+    assert get(server) == b"ok"
+    assert resolver["lookups"] == 2
@@ -0,0 +1,58 @@
+import time
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+from app.core.database import Base
+from app.models.leader import LeaderLease
+from app.services.feed_fetcher import FeedFetcher
+from app.services.leader import LeaderHeartbeat, Leadership
+from tests.test_twitter_ingestion import subscribe
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File database, so the heartbeat thread gets a connection of its own"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'leader.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def test_heartbeat_keeps_leadership_through_a_long_sweep(engine):
+    leader = Leadership("scheduler", lease_seconds=1, holder="leader")
+    rival = Leadership("scheduler", lease_seconds=1, holder="rival")
+    with Session(engine) as db:
+        assert leader.acquire(db)
+
+        with LeaderHeartbeat(leader, lambda: Session(engine)) as heartbeat:
+            time.sleep(2)
+            assert heartbeat.held()
+            assert not rival.acquire(db)
+
+
+def test_heartbeat_reports_lost_leadership(engine):
+    leader = Leadership("scheduler", lease_seconds=1, holder="leader")
+    with Session(engine) as db:
+        assert leader.acquire(db)
+
+        with LeaderHeartbeat(leader, lambda: Session(engine)) as heartbeat:
+            # Another process took over, e.g. after this one stalled
+            db.execute(update(LeaderLease).values(holder="rival"))
+            db.commit()
+            time.sleep(0.7)
+            assert not heartbeat.held()
+            assert not leader.is_leader
+
+
+def test_sweep_stops_once_told_to(engine, twitter_stub):
+    twitter_stub.add_user("alice", "42")
+    twitter_stub.tweet("42", 101)
+    with Session(engine) as db:
+        source = subscribe(db, username="alice")
+
+        results = FeedFetcher(db).fetch_due_feeds(worker_id="leader", keep_going=lambda: False)
+
+        assert results == {}
+        db.refresh(source)
+        assert source.lease_owner is None
+        assert source.since_id is None
@@ -0,0 +1,75 @@
+import math
+import re
+from app.core.metrics import CallbackGauge, Counter, Gauge, Histogram, Registry
+
+
+def render(*build):
+    registry = Registry()
+    for metric in build:
+        metric(registry)
+    return registry.render().splitlines()
+
+
+def test_label_values_are_escaped():
+    def build(registry):
+        Counter("requests", "Requests", ["path"], registry=registry).labels('a\\b "c"\nd').inc()
+
+    assert render(build)[2] == 'requests_total{path="a\\\\b \\"c\\"\\nd"} 1'
+
+
+def test_help_text_is_escaped():
+    lines = render(lambda registry: Gauge("depth", 'Queue "depth"\nback\\slash', registry=registry))
+    assert lines[:2] == ['# HELP depth Queue "depth"\\nback\\\\slash', "# TYPE depth gauge"]
+
+
+def test_histogram_buckets_are_cumulative_and_end_at_inf():
+    def build(registry):
+        histogram = Histogram("latency", "Latency", ["route"], buckets=(0.5, 0.1, 1), registry=registry)
+        for value in (0.05, 0.1, 0.3, 2):
+            histogram.labels("/items").observe(value)
+
+    assert render(build) == [
+        "# HELP latency Latency",
+        "# TYPE latency histogram",
+        'latency_bucket{route="/items",le="0.1"} 2',
+        'latency_bucket{route="/items",le="0.5"} 3',
+        'latency_bucket{route="/items",le="1"} 3',
+        'latency_bucket{route="/items",le="+Inf"} 4',
+        'latency_sum{route="/items"} 2.45',
+        'latency_count{route="/items"} 4',
+    ]
+
+
+def test_unlabelled_histogram_has_no_empty_braces():
+    def build(registry):
+        with Histogram("sweep", "Sweep", buckets=(1,), registry=registry).time():
+            pass
+
+    lines = render(build)
+    assert lines[2:4] == ['sweep_bucket{le="1"} 1', 'sweep_bucket{le="+Inf"} 1']
+    assert lines[4].startswith("sweep_sum ")
+    assert lines[5] == "sweep_count 1"
+
+
+def test_special_values():
+    def build(registry):
+        CallbackGauge("odd", "Odd", ["kind"], lambda: {
+            ("nan",): math.nan, ("inf",): math.inf, ("-inf",): -math.inf, ("half",): 0.5, ("whole",): 3.0
+        }, registry=registry)
+
+    assert render(build)[2:] == [
+        'odd{kind="nan"} NaN',
+        'odd{kind="inf"} +Inf',
+        'odd{kind="-inf"} -Inf',
+        'odd{kind="half"} 0.5',
+        'odd{kind="whole"} 3',
+    ]
+
+
+def test_app_metrics_render_valid_lines():
+    from app.core.metrics import REGISTRY
+    from app.services import feed_fetcher, twitter_budget  # noqa: F401 - registers their metrics
+
+    sample = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\\n]|\\.)*",?)*\})? \S+$')
+    for line in REGISTRY.render().splitlines():
+        assert line.startswith(("# HELP ", "# TYPE ")) or sample.match(line), line
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.services.poll_schedule import poll_interval
+
+NOW = datetime(2026, 1, 31, 12, 0)
+
+
+def burst(newest: datetime, count: int = 10, gap: timedelta = timedelta(minutes=5)):
+    return [newest - gap * i for i in range(count)]
+
+
+def test_active_feed_is_polled_at_the_minimum():
+    published = burst(NOW - timedelta(minutes=2))
+    assert poll_interval(published, None, now=NOW) == settings.POLL_MIN_INTERVAL_MINUTES * 60
+
+
+def test_dormant_feed_backs_off_despite_a_past_burst():
+    published = burst(NOW - timedelta(days=30))
+    assert poll_interval(published, None, now=NOW) == settings.POLL_MAX_INTERVAL_MINUTES * 60
+
+
+def test_quiet_time_stretches_the_interval():
+    published = burst(NOW - timedelta(hours=4))
+    assert poll_interval(published, None, now=NOW) == 2 * 3600
@@ -0,0 +1,57 @@
+from datetime import datetime
+from app.models.feed import ContentBlob, Feed, FeedItem, FeedType, SourceEntry
+from app.models.user import User
+from app.services.content_store import content_hash
+from app.services.feed_fetcher import FeedFetcher
+from app.services.feed_sources import get_or_create_source
+
+
+def subscribe(db):
+    user = User(email="reader@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    source = get_or_create_source(db, FeedType.RSS, "https://example.com/feed.xml", {})
+    db.add(Feed(user_id=user.id, source_id=source.id, name="Example", url=source.url, feed_type=FeedType.RSS))
+    db.commit()
+    return source
+
+
+def fetched(*items):
+    return {
+        'etag': None, 'modified': None, 'status': 200, 'update_interval': None,
+        'items': [
+            {'title': f"Post {number}", 'url': f"https://example.com/{number}", 'content': content,
+             'published_at': datetime(2026, 1, number)}
+            for number, content in items
+        ],
+    }
+
+
+def test_new_entries_reference_their_bodies(db):
+    source = subscribe(db)
+    new_items = FeedFetcher(db)._store_items(source, fetched((1, "<p>One</p>"), (2, "<p>Two</p>"), (3, None)))
+
+    assert list(new_items.values()) == [3]
+    # Items carry their subscriber, for the all-items listing
+    assert {item.user_id for item in db.query(FeedItem)} == {db.query(Feed.user_id).scalar()}
+    hashes = {entry.url: entry.content_hash for entry in db.query(SourceEntry)}
+    assert hashes == {
+        "https://example.com/1": content_hash("<p>One</p>"),
+        "https://example.com/2": content_hash("<p>Two</p>"),
+        "https://example.com/3": None,
+    }
+    assert db.get(ContentBlob, hashes["https://example.com/2"]).text == "<p>Two</p>"
+
+
+def test_known_entries_store_no_bodies(db):
+    source = subscribe(db)
+    fetcher = FeedFetcher(db)
+    fetcher._store_items(source, fetched((1, "<p>One</p>")))
+
+    # Entry 1 is already stored, so its edited body is never written
+    new_items = fetcher._store_items(source, fetched((1, "<p>One, edited</p>"), (2, "<p>Two</p>")))
+
+    assert list(new_items.values()) == [1]
+    feed = db.query(Feed).one()
+    assert (feed.item_count, feed.unread_count) == (2, 2)
+    assert {blob.hash for blob in db.query(ContentBlob)} == {content_hash("<p>One</p>"), content_hash("<p>Two</p>")}
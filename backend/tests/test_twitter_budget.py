@@ -0,0 +1,79 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.services.twitter_budget import BudgetExhausted, TwitterBudget, USER_TWEETS, reset_time
+
+
+def headers(limit, remaining, reset_in):
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(int(time.time()) + reset_in),
+    }
+
+
+def test_observe_records_reported_quota():
+    budget = TwitterBudget()
+    budget.observe(USER_TWEETS, headers(900, 3, 600))
+    assert budget.remaining() == {(USER_TWEETS,): 3}
+
+    for _ in range(3):
+        budget.take(USER_TWEETS)
+    with pytest.raises(BudgetExhausted):
+        budget.take(USER_TWEETS)
+
+
+def test_observe_ignores_responses_without_rate_limit_headers():
+    budget = TwitterBudget()
+    budget.observe(USER_TWEETS, {"content-type": "application/json"})
+    budget.observe(USER_TWEETS, {**headers(900, 3, 600), "x-rate-limit-remaining": "many"})
+    assert budget.remaining() == {}
+    assert budget.allowance(USER_TWEETS, 60) is None
+
+
+def test_expired_window_is_forgotten():
+    budget = TwitterBudget()
+    budget.observe(USER_TWEETS, headers(900, 0, -1))
+    budget.take(USER_TWEETS)
+    assert budget.allowance(USER_TWEETS, 60) is None
+
+
+def test_exhaust_holds_requests_until_reset():
+    budget = TwitterBudget()
+    reset_at = time.time() + 300
+    assert budget.exhaust(USER_TWEETS, reset_at) == reset_at
+
+    with pytest.raises(BudgetExhausted) as raised:
+        budget.take(USER_TWEETS)
+    assert raised.value.reset_at == reset_at
+    assert budget.allowance(USER_TWEETS, 60) == 0
+    assert budget.retry_at(USER_TWEETS, 60) == datetime.utcfromtimestamp(reset_at)
+
+
+def test_exhaust_without_reset_time_assumes_a_full_window():
+    budget = TwitterBudget()
+    reset_at = budget.exhaust(USER_TWEETS, None)
+    assert reset_at == pytest.approx(time.time() + 15 * 60, abs=5)
+
+
+def test_allowance_spreads_remaining_requests_over_the_window():
+    budget = TwitterBudget()
+    budget.observe(USER_TWEETS, headers(900, 89, 900))
+    assert budget.allowance(USER_TWEETS, 60) == 6
+
+    # Everything left may go once the window resets within the horizon
+    budget.observe(USER_TWEETS, headers(900, 89, 30))
+    assert budget.allowance(USER_TWEETS, 60) == 89
+
+
+def test_retry_at_waits_one_horizon_while_requests_are_left():
+    budget = TwitterBudget()
+    budget.observe(USER_TWEETS, headers(900, 5, 900))
+    expected = datetime.utcnow() + timedelta(seconds=60)
+    assert abs(budget.retry_at(USER_TWEETS, 60) - expected) < timedelta(seconds=5)
+
+
+def test_reset_time_parses_header():
+    assert reset_time({"x-rate-limit-reset": "1700000000"}) == 1700000000.0
+    assert reset_time({}) is None
+    assert reset_time({"x-rate-limit-reset": "soon"}) is None
@@ -0,0 +1,106 @@
+from datetime import datetime
+from app.models.feed import Feed, FeedSource, FeedType, SourceEntry
+from app.models.user import User
+from app.services.feed_fetcher import FeedFetcher
+from app.services.feed_sources import get_or_create_source
+
+
+def subscribe(db, **config) -> FeedSource:
+    user = db.query(User).first()
+    if user is None:
+        user = User(email="reader@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+    source = get_or_create_source(db, FeedType.TWITTER, "", config)
+    db.add(Feed(user_id=user.id, source_id=source.id, name="Tweets", url=source.url,
+                feed_type=FeedType.TWITTER, config=config))
+    db.commit()
+    return source
+
+
+def entry_urls(db, source: FeedSource):
+    return {url for (url,) in db.query(SourceEntry.url).filter(SourceEntry.source_id == source.id)}
+
+
+def test_second_fetch_asks_only_for_newer_tweets(db, twitter_stub):
+    twitter_stub.add_user("alice", "42")
+    twitter_stub.tweet("42", 101, 102, 103)
+    source = subscribe(db, username="alice")
+
+    fetcher = FeedFetcher(db)
+    fetcher.fetch_source(source)
+    assert source.since_id == "103"
+    assert "since_id" not in twitter_stub.requests_to("/2/users/42/tweets")[0]
+
+    twitter_stub.tweet("42", 104, 105)
+    new_items = fetcher.fetch_source(source)
+
+    second = twitter_stub.requests_to("/2/users/42/tweets")[1]
+    assert second["since_id"] == "103"
+    assert sum(new_items.values()) == 2
+    assert source.since_id == "105"
+    assert len(entry_urls(db, source)) == 5
+
+
+def test_backlog_is_read_in_pages(db, twitter_stub):
+    twitter_stub.add_user("alice", "42")
+    twitter_stub.tweet("42", 1)
+    source = subscribe(db, username="alice")
+    fetcher = FeedFetcher(db)
+    fetcher.fetch_source(source)
+
+    twitter_stub.tweet("42", *range(2, 252))
+    fetcher.fetch_source(source)
+
+    pages = twitter_stub.requests_to("/2/users/42/tweets")[1:]
+    assert [page.get("pagination_token") for page in pages] == [None, "100", "200"]
+    assert len(entry_urls(db, source)) == 251
+    assert source.since_id == "251"
+
+
+def test_users_are_resolved_in_one_batched_lookup(db, twitter_stub):
+    handles = ["alice", "bob", "carol"]
+    for number, handle in enumerate(handles, start=1):
+        twitter_stub.add_user(handle, str(number))
+        twitter_stub.tweet(str(number), 100 * number)
+        subscribe(db, username=handle)
+
+    results = FeedFetcher(db).fetch_all_feeds()
+
+    assert all(result["success"] for result in results.values())
+    lookups = twitter_stub.requests_to("/2/users/by")
+    assert len(lookups) == 1
+    assert sorted(lookups[0]["usernames"].split(",")) == handles
+
+    # Resolved IDs are reused by later sweeps
+    FeedFetcher(db).fetch_all_feeds()
+    assert len(twitter_stub.requests_to("/2/users/by")) == 1
+
+
+def test_hashtag_search_uses_since_id(db, twitter_stub):
+    twitter_stub.searches["#news"] = [7, 8]
+    source = subscribe(db, hashtag="news")
+    fetcher = FeedFetcher(db)
+    fetcher.fetch_source(source)
+
+    twitter_stub.searches["#news"].append(9)
+    assert sum(fetcher.fetch_source(source).values()) == 1
+    assert twitter_stub.requests_to("/2/tweets/search/recent")[1]["since_id"] == "8"
+
+
+def test_rate_limited_fetch_is_deferred_until_reset(db, twitter_stub):
+    twitter_stub.add_user("alice", "42")
+    twitter_stub.tweet("42", 101)
+    twitter_stub.limit(rate_limit=900, remaining=0, reset_in=600)
+    source = subscribe(db, username="alice")
+
+    fetcher = FeedFetcher(db)
+    assert fetcher.fetch_source(source) == {}
+    assert source.next_fetch_at == datetime.utcfromtimestamp(twitter_stub.reset_at)
+    assert source.error_count == 0
+    assert source.last_error is None
+
+    # The 429 is remembered, so nothing is sent again before the reset
+    assert fetcher.fetch_source(source) == {}
+    assert len(twitter_stub.requests_to("/2/users/42/tweets")) == 1
+    assert not entry_urls(db, source)
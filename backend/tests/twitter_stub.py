@@ -0,0 +1,141 @@
+"""
+Local stand-in for the parts of the Twitter API v2 the fetcher uses.
+
+Serves user lookup (GET /2/users/by), user timelines
+(GET /2/users/:id/tweets) and recent search (GET /2/tweets/search/recent)
+with since_id and page tokens, and records every request so tests can
+assert what was asked for. Timelines and search can be put under a rate
+limit, reported in x-rate-limit-* headers and answered with 429 once used
+up. Point TWITTER_API_URL at `base_url`.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+CREATED_AT = "2026-01-01T00:00:00.000Z"
+
+
+class TwitterStub:
+    def __init__(self):
+        self.users: Dict[str, str] = {}  # Lowercased username -> user ID
+        self.timelines: Dict[str, List[int]] = {}  # User ID -> tweet IDs
+        self.searches: Dict[str, List[int]] = {}  # Query -> tweet IDs
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.rate_limit: Optional[int] = None  # Timeline and search requests per window, None for unlimited
+        self.remaining = 0
+        self.reset_at = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_user(self, username: str, user_id: str) -> None:
+        self.users[username.lower()] = user_id
+        self.timelines.setdefault(user_id, [])
+
+    def tweet(self, user_id: str, *tweet_ids: int) -> None:
+        self.timelines[user_id].extend(tweet_ids)
+
+    def limit(self, rate_limit: int, remaining: int, reset_in: int = 900) -> None:
+        self.rate_limit = rate_limit
+        self.remaining = remaining
+        self.reset_at = int(time.time()) + reset_in
+
+    def requests_to(self, path: str) -> List[Dict[str, str]]:
+        return [params for requested, params in self.requests if requested == path]
+
+    def __enter__(self) -> "TwitterStub":
+        threading.Thread(target=self._httpd.serve_forever, name="twitter-stub", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _lookup(self, params: Dict[str, str]) -> dict:
+        found = [name for name in params["usernames"].split(",") if name.lower() in self.users]
+        missing = [name for name in params["usernames"].split(",") if name.lower() not in self.users]
+        body = {"data": [{"id": self.users[name.lower()], "name": name, "username": name} for name in found]}
+        if missing:
+            body["errors"] = [
+                {"value": name, "detail": f"Could not find user with usernames: [{name}].",
+                 "title": "Not Found Error", "type": "https://api.twitter.com/2/problems/resource-not-found"}
+                for name in missing
+            ]
+        return body
+
+    def _timeline(self, tweet_ids: List[int], params: Dict[str, str]) -> dict:
+        # Newest first, newer than since_id, one page per request
+        since_id = int(params.get("since_id", 0))
+        newer = sorted((tweet_id for tweet_id in tweet_ids if tweet_id > since_id), reverse=True)
+        start = int(params.get("pagination_token") or params.get("next_token") or 0)
+        page = newer[start:start + int(params.get("max_results", 10))]
+        meta = {"result_count": len(page)}
+        if page:
+            meta.update(newest_id=str(page[0]), oldest_id=str(page[-1]))
+        if start + len(page) < len(newer):
+            meta["next_token"] = str(start + len(page))
+        body = {"meta": meta}
+        if page:
+            body["data"] = [
+                {"id": str(tweet_id), "text": f"Tweet {tweet_id}", "created_at": CREATED_AT,
+                 "edit_history_tweet_ids": [str(tweet_id)]}
+                for tweet_id in page
+            ]
+        return body
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                with stub._lock:
+                    stub.requests.append((parts.path, params))
+
+                segments = parts.path.strip("/").split("/")
+                if parts.path == "/2/users/by":
+                    body = stub._lookup(params)
+                elif parts.path == "/2/tweets/search/recent":
+                    body = stub._timeline(stub.searches.get(params["query"], []), params)
+                elif len(segments) == 4 and segments[:2] == ["2", "users"] and segments[3] == "tweets" \
+                        and segments[2] in stub.timelines:
+                    body = stub._timeline(stub.timelines[segments[2]], params)
+                else:
+                    self.send_error(404)
+                    return
+
+                code, headers = 200, {}
+                if stub.rate_limit is not None and parts.path != "/2/users/by":
+                    with stub._lock:
+                        if stub.remaining > 0:
+                            stub.remaining -= 1
+                        else:
+                            code, body = 429, {"title": "Too Many Requests", "detail": "Too Many Requests",
+                                               "type": "about:blank", "status": 429}
+                        headers = {"x-rate-limit-limit": stub.rate_limit, "x-rate-limit-remaining": stub.remaining,
+                                   "x-rate-limit-reset": stub.reset_at}
+
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, str(value))
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
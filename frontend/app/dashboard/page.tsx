@@ -1,36 +1,59 @@
 'use client'
 
-import { useState } from 'react'
-import { useQuery } from '@tanstack/react-query'
+import { useEffect, useState } from 'react'
+import { useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { itemsApi } from '@/lib/api'
 import FeedItem from '@/components/FeedItem'
 import CategoryTree from '@/components/CategoryTree'
 import FeedList from '@/components/FeedList'
 
+const SEARCH_DEBOUNCE_MS = 300
+
 export default function DashboardPage() {
   const [selectedCategory, setSelectedCategory] = useState<number | null>(null)
   const [selectedFeed, setSelectedFeed] = useState<number | null>(null)
   const [unreadOnly, setUnreadOnly] = useState(false)
   const [searchQuery, setSearchQuery] = useState('')
   const [sinceDate, setSinceDate] = useState<string>('')
+  const [searchTerms, setSearchTerms] = useState('')
+
+  // Search once typing pauses rather than on every keystroke
+  useEffect(() => {
+    const timer = setTimeout(() => setSearchTerms(searchQuery.trim()), SEARCH_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [searchQuery])
+
+  // One page per request; "Load more" follows the server's next_cursor.
+  // With search terms the server's full-text search supplies the pages;
+  // it ranks by relevance and has no unread filter.
+  const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery({
+    queryKey: ['items', searchTerms, selectedCategory, selectedFeed, unreadOnly, sinceDate],
+    queryFn: ({ pageParam }) => {
+      const params = {
+        category_id: selectedCategory || undefined,
+        feed_id: selectedFeed || undefined,
+        since_date: sinceDate || undefined,
+        cursor: pageParam,
+      }
+      return searchTerms
+        ? itemsApi.search(searchTerms, params)
+        : itemsApi.getAll({ ...params, unread_only: unreadOnly })
+    },
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+  })
+  const items = data?.pages.flatMap((page) => page.items) ?? []
 
-  const { data: items = [], isLoading } = useQuery({
-    queryKey: ['items', selectedCategory, selectedFeed, unreadOnly, sinceDate],
-    queryFn: () => itemsApi.getAll({
+  const queryClient = useQueryClient()
+  const markAllReadMutation = useMutation({
+    mutationFn: () => itemsApi.markAllRead({
       category_id: selectedCategory || undefined,
       feed_id: selectedFeed || undefined,
-      unread_only: unreadOnly,
-      since_date: sinceDate || undefined,
     }),
-  })
-
-  const filteredItems = items.filter((item: any) => {
-    if (!searchQuery) return true
-    const query = searchQuery.toLowerCase()
-    return (
-      item.title.toLowerCase().includes(query) ||
-      (item.content && item.content.toLowerCase().includes(query))
-    )
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['items'] })
+      queryClient.invalidateQueries({ queryKey: ['counts'] })
+    },
   })
 
   return (
@@ -77,11 +100,18 @@ export default function DashboardPage() {
                 </h2>
                 {items.length > 0 && (
                   <p className="text-sm text-gray-500 mt-1">
-                    {filteredItems.length} {filteredItems.length === 1 ? 'item' : 'items'}
+                    {items.length}{hasNextPage && '+'} {items.length === 1 ? 'item' : 'items'}
                     {sinceDate && ` since ${sinceDate}`}
                   </p>
                 )}
               </div>
+              <button
+                onClick={() => markAllReadMutation.mutate()}
+                disabled={markAllReadMutation.isPending}
+                className="px-3 py-2 text-sm text-indigo-600 hover:text-indigo-700 disabled:opacity-50"
+              >
+                Mark all read
+              </button>
             </div>
             <div className="flex space-x-2">
               <input
@@ -117,16 +147,27 @@ export default function DashboardPage() {
               <div className="text-center py-12">
                 <div className="text-gray-500">Loading...</div>
               </div>
-            ) : filteredItems.length > 0 ? (
+            ) : items.length > 0 ? (
               <div className="space-y-4">
-                {filteredItems.map((item: any) => (
+                {items.map((item: any) => (
                   <FeedItem key={item.id} item={item} />
                 ))}
+                {hasNextPage && (
+                  <div className="text-center">
+                    <button
+                      onClick={() => fetchNextPage()}
+                      disabled={isFetchingNextPage}
+                      className="px-4 py-2 text-sm text-indigo-600 hover:text-indigo-700 disabled:opacity-50"
+                    >
+                      {isFetchingNextPage ? 'Loading...' : 'Load more'}
+                    </button>
+                  </div>
+                )}
               </div>
             ) : (
               <div className="text-center py-12">
                 <div className="text-gray-500">
-                  {searchQuery ? 'No items match your search' : 'No items found'}
+                  {searchTerms ? 'No items match your search' : 'No items found'}
                 </div>
               </div>
             )}
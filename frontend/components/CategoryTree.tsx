@@ -1,7 +1,7 @@
 'use client'
 
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { categoriesApi, feedsApi } from '@/lib/api'
+import { categoriesApi, countsApi } from '@/lib/api'
 import { useState } from 'react'
 
 interface Category {
@@ -16,15 +16,15 @@ interface CategoryTreeProps {
   onSelectCategory: (id: number | null) => void
 }
 
-function CategoryNode({ category, selectedCategory, onSelect, level = 0, feeds = [] }: {
+function CategoryNode({ category, selectedCategory, onSelect, level = 0, unread }: {
   category: Category
   selectedCategory: number | null
   onSelect: (id: number) => void
   level?: number
-  feeds?: any[]
+  unread: Map<number, number>
 }) {
   const isSelected = selectedCategory === category.id
-  const categoryFeeds = feeds.filter((f: any) => f.category_id === category.id)
+  const unreadCount = unread.get(category.id) ?? 0
 
   return (
     <div>
@@ -37,8 +37,8 @@ function CategoryNode({ category, selectedCategory, onSelect, level = 0, feeds =
       >
         <div className="flex items-center justify-between">
           <span className="text-sm">{category.name}</span>
-          {categoryFeeds.length > 0 && (
-            <span className="text-xs text-gray-500 ml-2">({categoryFeeds.length})</span>
+          {unreadCount > 0 && (
+            <span className="text-xs text-gray-500 ml-2">{unreadCount}</span>
           )}
         </div>
       </div>
@@ -51,7 +51,7 @@ function CategoryNode({ category, selectedCategory, onSelect, level = 0, feeds =
               selectedCategory={selectedCategory}
               onSelect={onSelect}
               level={level + 1}
-              feeds={feeds}
+              unread={unread}
             />
           ))}
         </div>
@@ -71,10 +71,13 @@ export default function CategoryTree({ selectedCategory, onSelectCategory }: Cat
     queryFn: categoriesApi.getAll,
   })
   
-  const { data: feeds = [] } = useQuery({
-    queryKey: ['feeds'],
-    queryFn: feedsApi.getAll,
+  const { data: counts } = useQuery({
+    queryKey: ['counts'],
+    queryFn: countsApi.get,
   })
+  const unread = new Map<number, number>(
+    (counts?.categories ?? []).map((c: any) => [c.id, c.unread_count])
+  )
 
   const createMutation = useMutation({
     mutationFn: categoriesApi.create,
@@ -162,7 +165,7 @@ export default function CategoryTree({ selectedCategory, onSelectCategory }: Cat
               category={category}
               selectedCategory={selectedCategory}
               onSelect={onSelectCategory}
-              feeds={feeds || []}
+              unread={unread}
             />
           ))
         )}
@@ -1,6 +1,6 @@
 'use client'
 
-import { useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { itemsApi } from '@/lib/api'
 import { format } from 'date-fns'
 import { useState } from 'react'
@@ -10,7 +10,7 @@ interface FeedItemProps {
   item: {
     id: number
     title: string
-    content: string | null
+    excerpt: string | null
     url: string
     published_at: string | null
     read_at: string | null
@@ -22,10 +22,18 @@ export default function FeedItem({ item }: FeedItemProps) {
   const [isExpanded, setIsExpanded] = useState(false)
   const queryClient = useQueryClient()
 
+  // Lists carry only an excerpt; load the full body when expanded
+  const { data: fullItem } = useQuery({
+    queryKey: ['item', item.id],
+    queryFn: () => itemsApi.getById(item.id),
+    enabled: isExpanded,
+  })
+
   const markReadMutation = useMutation({
     mutationFn: () => itemsApi.markRead(item.id),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['items'] })
+      queryClient.invalidateQueries({ queryKey: ['counts'] })
     },
   })
 
@@ -33,6 +41,7 @@ export default function FeedItem({ item }: FeedItemProps) {
     mutationFn: () => itemsApi.markUnread(item.id),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['items'] })
+      queryClient.invalidateQueries({ queryKey: ['counts'] })
     },
   })
 
@@ -66,12 +75,14 @@ export default function FeedItem({ item }: FeedItemProps) {
                 {format(new Date(item.published_at), 'MMM d, yyyy h:mm a')}
               </p>
             )}
-            {item.content && (
-              <div className={`text-gray-700 ${isExpanded ? '' : 'line-clamp-3'}`}>
-                <div dangerouslySetInnerHTML={{ __html: item.content }} />
+            {isExpanded && fullItem?.content ? (
+              <div className="text-gray-700">
+                <div dangerouslySetInnerHTML={{ __html: fullItem.content }} />
               </div>
+            ) : item.excerpt && (
+              <p className="text-gray-700 line-clamp-3">{item.excerpt}</p>
             )}
-            {item.content && item.content.length > 150 && (
+            {item.excerpt && item.excerpt.length > 150 && (
               <button
                 onClick={() => setIsExpanded(!isExpanded)}
                 className="text-sm text-indigo-600 hover:text-indigo-700 mt-2"
@@ -1,7 +1,7 @@
 'use client'
 
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { feedsApi } from '@/lib/api'
+import { countsApi, feedsApi } from '@/lib/api'
 import { useState } from 'react'
 
 interface Feed {
@@ -29,6 +29,14 @@ export default function FeedList({ selectedFeed, onSelectFeed, selectedCategory
     queryKey: ['feeds'],
     queryFn: feedsApi.getAll,
   })
+
+  const { data: counts } = useQuery({
+    queryKey: ['counts'],
+    queryFn: countsApi.get,
+  })
+  const unreadByFeed = new Map<number, number>(
+    (counts?.feeds ?? []).map((c: any) => [c.id, c.unread_count])
+  )
   
   // Filter feeds by selected category
   // When a category is selected, show feeds in that category
@@ -42,6 +50,7 @@ export default function FeedList({ selectedFeed, onSelectFeed, selectedCategory
     onSuccess: (data) => {
       queryClient.invalidateQueries({ queryKey: ['feeds'] })
       queryClient.invalidateQueries({ queryKey: ['items'] })  // Refresh items after RSS fetch
+      queryClient.invalidateQueries({ queryKey: ['counts'] })
       setShowAddForm(false)
       setFeedName('')
       setFeedUrl('')
@@ -64,6 +73,7 @@ export default function FeedList({ selectedFeed, onSelectFeed, selectedCategory
     mutationFn: feedsApi.fetch,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['items'] })
+      queryClient.invalidateQueries({ queryKey: ['counts'] })
     },
   })
 
@@ -86,6 +96,7 @@ export default function FeedList({ selectedFeed, onSelectFeed, selectedCategory
           if (feedType === 'rss') {
             // The backend will auto-fetch, but we can also invalidate items to refresh
             queryClient.invalidateQueries({ queryKey: ['items'] })
+            queryClient.invalidateQueries({ queryKey: ['counts'] })
           }
         }
       })
@@ -211,6 +222,9 @@ export default function FeedList({ selectedFeed, onSelectFeed, selectedCategory
                   className="flex-1 text-left text-sm text-gray-700"
                 >
                   {feed.name}
+                  {(unreadByFeed.get(feed.id) ?? 0) > 0 && (
+                    <span className="text-xs text-indigo-600 ml-2">{unreadByFeed.get(feed.id)}</span>
+                  )}
                 </button>
                 <div className="flex items-center space-x-1 opacity-0 group-hover:opacity-100 transition-opacity">
                   <button
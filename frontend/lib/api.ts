@@ -32,6 +32,12 @@ api.interceptors.response.use(
 
 export default api
 
+// Item lists come a page at a time; pass next_cursor back as `cursor` for the next page
+export interface ItemPage {
+  items: any[]
+  next_cursor: string | null
+}
+
 // Helper function to extract error message from API response
 function extractErrorMessage(error: any): string {
   if (error.response?.data?.detail) {
@@ -124,8 +130,8 @@ export const feedsApi = {
     const response = await api.post(`/api/feeds/${id}/fetch`)
     return response.data
   },
-  getItems: async (id: number) => {
-    const response = await api.get(`/api/feeds/${id}/items`)
+  getItems: async (id: number, cursor?: string): Promise<ItemPage> => {
+    const response = await api.get(`/api/feeds/${id}/items`, { params: { cursor } })
     return response.data
   },
 }
@@ -161,18 +167,22 @@ export const categoriesApi = {
   removeItem: async (assignmentId: number) => {
     await api.delete(`/api/categories/assign/${assignmentId}`)
   },
-  getItems: async (id: number) => {
-    const response = await api.get(`/api/categories/${id}/items`)
+  getItems: async (id: number, cursor?: string): Promise<ItemPage> => {
+    const response = await api.get(`/api/categories/${id}/items`, { params: { cursor } })
     return response.data
   },
 }
 
 // Items API
 export const itemsApi = {
-  getAll: async (params?: { category_id?: number; feed_id?: number; unread_only?: boolean; since_date?: string }) => {
+  getAll: async (params?: { category_id?: number; feed_id?: number; unread_only?: boolean; since_date?: string; cursor?: string }): Promise<ItemPage> => {
     const response = await api.get('/api/items', { params })
     return response.data
   },
+  search: async (q: string, params?: { category_id?: number; feed_id?: number; since_date?: string; cursor?: string }): Promise<ItemPage> => {
+    const response = await api.get('/api/items/search', { params: { q, ...params } })
+    return response.data
+  },
   getById: async (id: number) => {
     const response = await api.get(`/api/items/${id}`)
     return response.data
@@ -185,9 +195,20 @@ export const itemsApi = {
     const response = await api.post(`/api/items/${id}/mark-unread`)
     return response.data
   },
+  markAllRead: async (selection: { feed_id?: number; category_id?: number; before?: string; item_ids?: number[] }) => {
+    const response = await api.post('/api/items/mark-read', selection)
+    return response.data
+  },
   getCategories: async (id: number) => {
     const response = await api.get(`/api/items/${id}/categories`)
     return response.data
   },
 }
 
+// Counts API
+export const countsApi = {
+  get: async () => {
+    const response = await api.get('/api/counts')
+    return response.data
+  },
+}